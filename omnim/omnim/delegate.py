@@ -1,90 +1,389 @@
-from typing import Callable, Generic, Iterator, TypeVar, TypeVarTuple
+import asyncio
+from concurrent.futures import Executor, TimeoutError as _FutureTimeout
+from enum import Enum
+from functools import reduce
+from inspect import isawaitable, ismethod
+from itertools import count
+from time import monotonic
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Generic,
+    Iterator,
+    Optional,
+    TypeVar,
+    TypeVarTuple,
+)
+from weakref import WeakMethod, ref
 
 
 T_RESULT = TypeVar("T_RESULT")
 T_SOURCE = TypeVarTuple("T_SOURCE")
 
+_pruned_total = 0
 
-class action(Generic[*T_SOURCE]):
-    def __init__(self, *callbacks: Callable[[*T_SOURCE], None]) -> None:
-        self.__callbacks = list(callbacks)
 
-    def register(self, *callbacks: Callable[[*T_SOURCE], None]) -> None:
+def pruned_count() -> int:
+    """
+    weak callbacks removed process-wide because their target was collected
+    without unregistering; each one would have been a leak with `register`.
+    """
+    return _pruned_total
+
+
+class result_policy(Enum):
+    """
+    how `func.invoke` turns callback results into one value
+
+    - first: only the first callback runs
+    - last: every callback runs in order, the last result is returned
+    - all: an iterator that runs each callback as it is advanced
+    - reduce: every callback runs, results are folded with `combiner`
+    - first_not_none: callbacks run in order until one returns non-None
+    """
+
+    first = 0
+    last = 1
+    all = 2
+    reduce = 3
+    first_not_none = 4
+
+
+class subscription:
+    """token returned by `register`, removing its callbacks in O(1) on `dispose()`"""
+
+    __slots__ = ("__owner", "__keys")
+
+    def __init__(self, owner: "_delegate", keys: tuple[int, ...]) -> None:
+        self.__owner: Optional[_delegate] = owner
+        self.__keys = keys
+
+    @property
+    def active(self) -> bool:
+        return self.__owner is not None
+
+    def dispose(self) -> None:
+        if self.__owner is not None:
+            self.__owner._discard(self.__keys)
+            self.__owner = None
+
+    def __enter__(self) -> "subscription":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.dispose()
+
+
+class _weak_callback:
+    """calls the target through a weak reference; bound methods use `WeakMethod`"""
+
+    __slots__ = ("ref",)
+
+    def __init__(
+        self,
+        callback: Callable[..., Any],
+        on_dead: Callable[[Any], None],
+    ) -> None:
+        self.ref = (WeakMethod if ismethod(callback) else ref)(callback, on_dead)
+
+    def __call__(self, *args: Any) -> Any:
+        if (callback := self.ref()) is not None:
+            return callback(*args)
+        return None
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, _weak_callback):
+            return self.ref == other.ref
+        return (callback := self.ref()) is not None and callback == other
+
+
+class _delegate:
+    """
+    callbacks live in an insertion-ordered dict keyed by registration id.
+    invocation iterates `_snapshot`, an immutable tuple rebuilt lazily after a
+    change, so callbacks may (un)register during dispatch without affecting it.
+
+    weak callbacks whose target is collected only queue their id (this can
+    happen inside a garbage collection) and are pruned on the next rebuild.
+    """
+
+    __slots__ = ("__ids", "__entries", "__dead", "__pruned", "_snapshot", "__weakref__")
+
+    def __init__(self, callbacks: tuple[Callable[..., Any], ...]) -> None:
+        self.__ids = count()
+        self.__entries: dict[int, Callable[..., Any]] = {}
+        self.__dead: list[int] = []
+        self.__pruned = 0
+        self._snapshot: Optional[tuple[Callable[..., Any], ...]] = ()
+        self._add(callbacks)
+
+    @property
+    def pruned(self) -> int:
+        """weak callbacks removed because their target was collected"""
+        self.__prune()
+        return self.__pruned
+
+    def _add(self, callbacks: tuple[Callable[..., Any], ...]) -> subscription:
+        keys = tuple(next(self.__ids) for _ in callbacks)
+        self.__entries.update(zip(keys, callbacks))
+        if keys:
+            self._snapshot = None
+        return subscription(self, keys)
+
+    def _add_weak(self, callbacks: tuple[Callable[..., Any], ...]) -> subscription:
+        owner = ref(self)
+        keys = []
         for cb in callbacks:
-            self.__callbacks.append(cb)
+            key = next(self.__ids)
+
+            def on_dead(_: Any, key: int = key) -> None:
+                if (delegate := owner()) is not None:
+                    delegate.__dead.append(key)
+                    delegate._snapshot = None
+
+            self.__entries[key] = _weak_callback(cb, on_dead)
+            keys.append(key)
+        if keys:
+            self._snapshot = None
+        return subscription(self, tuple(keys))
+
+    def _remove(self, callback: Callable[..., Any]) -> None:
+        for key, cb in self.__entries.items():
+            if cb == callback:
+                del self.__entries[key]
+                self._snapshot = None
+                return
+        raise ValueError(f"{callback!r} is not registered")
+
+    def _discard(self, keys: tuple[int, ...]) -> None:
+        for key in keys:
+            if self.__entries.pop(key, None) is not None:
+                self._snapshot = None
+
+    def _rebuild(self) -> tuple[Callable[..., Any], ...]:
+        self.__prune()
+        self._snapshot = tuple(self.__entries.values())
+        return self._snapshot
+
+    def __prune(self) -> None:
+        global _pruned_total
+        while self.__dead:
+            if self.__entries.pop(self.__dead.pop(), None) is not None:
+                self.__pruned += 1
+                _pruned_total += 1
+
+    def clear(self) -> None:
+        self.__entries.clear()
+        self.__dead.clear()
+        self._snapshot = ()
+
+    def __len__(self) -> int:
+        self.__prune()
+        return len(self.__entries)
+
+
+class action(_delegate, Generic[*T_SOURCE]):
+    __slots__ = ()
+
+    def __init__(self, *callbacks: Callable[[*T_SOURCE], None]) -> None:
+        super().__init__(callbacks)
+
+    def register(self, *callbacks: Callable[[*T_SOURCE], None]) -> subscription:
+        return self._add(callbacks)
+
+    def register_weak(self, *callbacks: Callable[[*T_SOURCE], None]) -> subscription:
+        """
+        hold `callbacks` through weak references, so registering does not keep
+        their owners alive. a lambda or closure with no other reference is
+        collected (and pruned) immediately.
+        """
+        return self._add_weak(callbacks)
 
     def unregister(self, *callbacks: Callable[[*T_SOURCE], None]) -> None:
         for cb in callbacks:
-            self.__callbacks.remove(cb)
+            self._remove(cb)
 
     def invoke(self, *args: *T_SOURCE) -> None:
-        if self.__callbacks:
-            for cb in self.__callbacks:
-                cb(*args)
+        callbacks = self._snapshot
+        if callbacks is None:
+            callbacks = self._rebuild()
+        for cb in callbacks:
+            cb(*args)
 
-    def as_callable(self) -> Iterator[Callable[[*T_SOURCE], None]]:
-        for cb in self.__callbacks:
-            yield cb
+    async def invoke_async(
+        self, *args: *T_SOURCE, timeout: Optional[float] = None
+    ) -> list[BaseException]:
+        """
+        call every callback and await the awaitables they return concurrently.
+        a failing or timed-out callback does not affect the others; the
+        exceptions are returned in registration order instead of raised.
+        """
+        callbacks = self._snapshot
+        if callbacks is None:
+            callbacks = self._rebuild()
+        errors: list[Optional[BaseException]] = []
+        indices: list[int] = []
+        pending: list[Awaitable[Any]] = []
+        for i, cb in enumerate(callbacks):
+            errors.append(None)
+            try:
+                result = cb(*args)
+            except Exception as e:
+                errors[i] = e
+                continue
+            if isawaitable(result):
+                indices.append(i)
+                pending.append(
+                    result if timeout is None else asyncio.wait_for(result, timeout)
+                )
+        if pending:
+            results = await asyncio.gather(*pending, return_exceptions=True)
+            for i, r in zip(indices, results):
+                if isinstance(r, BaseException):
+                    errors[i] = r
+        return [e for e in errors if e is not None]
+
+    def invoke_parallel(
+        self,
+        executor: Executor,
+        *args: *T_SOURCE,
+        timeout: Optional[float] = None,
+    ) -> list[BaseException]:
+        """
+        submit every callback to `executor` and wait for them, so dispatch takes
+        as long as the slowest callback. callbacks still running after
+        `timeout` are cancelled if possible and reported as `TimeoutError`.
+        """
+        callbacks = self._snapshot
+        if callbacks is None:
+            callbacks = self._rebuild()
+        futures = [executor.submit(cb, *args) for cb in callbacks]
+        deadline = None if timeout is None else monotonic() + timeout
+        errors: list[BaseException] = []
+        for future in futures:
+            try:
+                future.result(
+                    None if deadline is None else max(0.0, deadline - monotonic())
+                )
+            except _FutureTimeout as e:
+                future.cancel()
+                errors.append(e)
+            except Exception as e:
+                errors.append(e)
+        return errors
 
-    def clear(self) -> None:
-        self.__callbacks.clear()
+    def as_callable(self) -> Iterator[Callable[[*T_SOURCE], None]]:
+        callbacks = self._snapshot
+        if callbacks is None:
+            callbacks = self._rebuild()
+        yield from callbacks
 
     def __iadd__(self, callback: Callable[[*T_SOURCE], None]) -> "action[*T_SOURCE]":
-        self.__callbacks.append(callback)
+        self._add((callback,))
         return self
 
     def __isub__(self, callback: Callable[[*T_SOURCE], None]) -> "action[*T_SOURCE]":
-        self.__callbacks.remove(callback)
+        self._remove(callback)
         return self
 
-    def __len__(self) -> int:
-        return len(self.__callbacks)
-
     def __call__(self, *args: *T_SOURCE) -> None:
-        for cb in self.__callbacks:
+        callbacks = self._snapshot
+        if callbacks is None:
+            callbacks = self._rebuild()
+        for cb in callbacks:
             cb(*args)
 
 
-class func(Generic[*T_SOURCE, T_RESULT]):
-    def __init__(self, *callbacks: Callable[[*T_SOURCE], T_RESULT]) -> None:
-        self.__callbacks = list(callbacks)
+class func(_delegate, Generic[*T_SOURCE, T_RESULT]):
+    __slots__ = ("__policy", "__combiner")
 
-    def register(self, *callbacks: Callable[[*T_SOURCE], T_RESULT]) -> None:
-        for cb in callbacks:
-            self.__callbacks.append(cb)
+    def __init__(
+        self,
+        *callbacks: Callable[[*T_SOURCE], T_RESULT],
+        policy: result_policy = result_policy.first,
+        combiner: Optional[Callable[[T_RESULT, T_RESULT], T_RESULT]] = None,
+    ) -> None:
+        if policy is result_policy.reduce and combiner is None:
+            raise ValueError("reduce policy requires a combiner")
+        super().__init__(callbacks)
+        self.__policy = policy
+        self.__combiner = combiner
+
+    @property
+    def policy(self) -> result_policy:
+        return self.__policy
+
+    def register(self, *callbacks: Callable[[*T_SOURCE], T_RESULT]) -> subscription:
+        return self._add(callbacks)
+
+    def register_weak(
+        self, *callbacks: Callable[[*T_SOURCE], T_RESULT]
+    ) -> subscription:
+        """see `action.register_weak`; a collected callback yields None"""
+        return self._add_weak(callbacks)
 
     def unregister(self, *callbacks: Callable[[*T_SOURCE], T_RESULT]) -> None:
         for cb in callbacks:
-            self.__callbacks.remove(cb)
+            self._remove(cb)
 
     def invoke(self, *args: *T_SOURCE) -> T_RESULT:
-        if self.__callbacks.__len__() <= 0:
+        callbacks = self._snapshot
+        if callbacks is None:
+            callbacks = self._rebuild()
+
+        match self.__policy:
+            case result_policy.all:
+                return self.__iterate(callbacks, args)  # type: ignore
+            case result_policy.first_not_none:
+                for cb in callbacks:
+                    if (result := cb(*args)) is not None:
+                        return result
+                return None  # type: ignore
+
+        if not callbacks:
             raise ValueError("No callbacks registered")
-        return [cb(*args) for cb in self.__callbacks][0]
+        match self.__policy:
+            case result_policy.first:
+                return callbacks[0](*args)
+            case result_policy.last:
+                for cb in callbacks:
+                    result = cb(*args)
+                return result
+            case _:
+                return reduce(
+                    self.__combiner,  # type: ignore
+                    (cb(*args) for cb in callbacks),
+                )
+
+    def invoke_all(self, *args: *T_SOURCE) -> Iterator[T_RESULT]:
+        callbacks = self._snapshot
+        if callbacks is None:
+            callbacks = self._rebuild()
+        return self.__iterate(callbacks, args)
+
+    @staticmethod
+    def __iterate(callbacks: tuple, args: tuple) -> Iterator[T_RESULT]:
+        for cb in callbacks:
+            yield cb(*args)
 
     def as_callable(self) -> Callable[[*T_SOURCE], T_RESULT]:
         return self.__call__
 
-    def clear(self) -> None:
-        self.__callbacks.clear()
-
     def __iadd__(
         self, callback: Callable[[*T_SOURCE], T_RESULT]
     ) -> "func[*T_SOURCE, T_RESULT]":
-        self.__callbacks.append(callback)
+        self._add((callback,))
         return self
 
     def __isub__(
         self, callback: Callable[[*T_SOURCE], T_RESULT]
     ) -> "func[*T_SOURCE, T_RESULT]":
-        self.__callbacks.remove(callback)
+        self._remove(callback)
         return self
 
-    def __len__(self) -> int:
-        return len(self.__callbacks)
-
     def __call__(self, *args: *T_SOURCE) -> T_RESULT:
-        return [cb(*args) for cb in self.__callbacks][0]
+        return self.invoke(*args)
 
 
 def on_int_value_changed(i: int) -> None:
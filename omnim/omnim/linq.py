@@ -1,4 +1,17 @@
+import heapq
+import math
+import pickle
+import tempfile
+import threading
+from array import array
+from bisect import bisect_left
+from collections import deque
+from collections.abc import Container, Reversible, Sequence, Sized
+from enum import IntFlag
+from functools import reduce
+from operator import itemgetter
 from typing import (
+    IO,
     Any,
     Callable,
     Generator,
@@ -11,6 +24,11 @@ from typing import (
 from builtins import range as _range
 from builtins import any as _any
 from builtins import zip as _zip
+from builtins import sum as _sum
+from builtins import min as _min
+from builtins import max as _max
+from itertools import chain, dropwhile, groupby, islice, takewhile
+from itertools import repeat as _repeat
 
 T_SOURCE = TypeVar("T_SOURCE")
 T_RESULT = TypeVar("T_RESULT")
@@ -23,22 +41,64 @@ T_JOIN_INNER = TypeVar("T_JOIN_INNER")
 T_JOIN_SELECTOR_RESULT = TypeVar("T_JOIN_SELECTOR_RESULT")
 T_JOIN_RESULT = TypeVar("T_JOIN_RESULT")
 
+T_ACCUMULATE = TypeVar("T_ACCUMULATE")
+
+_MISSING: Any = object()
+
+
+class capability(IntFlag):
+    """
+    what a source supports without being enumerated.
+    terminal operators use these to pick O(1) / O(log n) paths.
+
+    `sorted` means ascending natural order of the elements themselves.
+    """
+
+    none = 0
+    sized = 1
+    indexable = 2
+    reversible = 4
+    sorted = 8
+
+
+_SEQUENCE = capability.sized | capability.indexable | capability.reversible
+
 
 class linq(Generic[T_SOURCE]):
-    def __init__(self, src: Iterator[T_SOURCE] | Iterable[T_SOURCE]) -> None:
+    def __init__(
+        self,
+        src: Iterator[T_SOURCE] | Iterable[T_SOURCE],
+        caps: capability = capability.none,
+    ) -> None:
         self.__src = src
+        self.__caps = _detect(src) | caps
 
     def __iter__(self) -> Iterator[T_SOURCE]:
         return iter(self.__src)
 
+    def __contains__(self, value: object) -> bool:
+        return contains(self, value)
+
+    @property
+    def capabilities(self) -> capability:
+        return self.__caps
+
+    def _unwrap(self) -> tuple[Iterable[T_SOURCE], capability]:
+        """innermost source and the capabilities it can be accessed with"""
+        src, _ = _inspect(self.__src)
+        return src, self.capabilities
+
     def count(self, pred: Optional[Callable[[T_SOURCE], bool]] = None) -> int:
-        return count(self.__src, pred)
+        return count(self, pred)
+
+    def contains(self, value: object) -> bool:
+        return contains(self, value)
 
     def any(self, pred: Optional[Callable[[T_SOURCE], bool]] = None) -> bool:
         return any(self, pred)
 
     def where(self, pred: Callable[[T_SOURCE], bool]) -> "linq[T_SOURCE]":
-        return linq(where(self, pred))
+        return linq(where(self, pred), self.__sorted)
 
     def select(self, pred: Callable[[T_SOURCE], T_RESULT]) -> "linq[T_RESULT]":
         return linq(select(self, pred))
@@ -48,7 +108,7 @@ class linq(Generic[T_SOURCE]):
         other: Iterable[T_ZIP_OUTER],
         selector: Callable[[T_SOURCE, T_ZIP_OUTER], T_ZIP_RESULT],
     ) -> "linq[T_ZIP_RESULT]":
-        return linq(zip(self.__src, other, selector))
+        return linq(zip(self, other, selector))
 
     def join(
         self,
@@ -70,29 +130,413 @@ class linq(Generic[T_SOURCE]):
 
     def order_by(
         self,
-        selector: Callable[[T_SOURCE], Any],
+        selector: Optional[Callable[[T_SOURCE], Any]] = None,
         descending: bool = False,
+        *,
+        run_size: Optional[int] = None,
+    ) -> "ordered_linq[T_SOURCE]":
+        return order_by(self, selector, descending, run_size=run_size)
+
+    def take(self, count: int) -> "linq[T_SOURCE]":
+        return linq(take(self, count), self.__sorted)
+
+    def skip(self, count: int) -> "linq[T_SOURCE]":
+        return linq(skip(self, count), self.__sorted)
+
+    def take_while(self, pred: Callable[[T_SOURCE], bool]) -> "linq[T_SOURCE]":
+        return linq(take_while(self, pred), self.__sorted)
+
+    def skip_while(self, pred: Callable[[T_SOURCE], bool]) -> "linq[T_SOURCE]":
+        return linq(skip_while(self, pred), self.__sorted)
+
+    def distinct(
+        self,
+        selector: Optional[Callable[[T_SOURCE], Any]] = None,
+        *,
+        capacity: Optional[int] = None,
+        error_rate: float = 0.01,
     ) -> "linq[T_SOURCE]":
-        return linq(iter(order_by(self, selector, descending)))
+        return linq(
+            distinct(self, selector, capacity=capacity, error_rate=error_rate),
+            self.__sorted,
+        )
+
+    def select_many(
+        self,
+        selector: Callable[[T_SOURCE], Iterable[T_RESULT]],
+    ) -> "linq[T_RESULT]":
+        return linq(select_many(self, selector))
+
+    def concat(self, *others: Iterable[T_SOURCE]) -> "linq[T_SOURCE]":
+        return linq(concat(self, *others))
+
+    def chunk(self, size: int) -> "linq[list[T_SOURCE]]":
+        return linq(chunk(self, size))
+
+    def window(self, size: int) -> "linq[tuple[T_SOURCE, ...]]":
+        return linq(window(self, size))
+
+    def aggregate(
+        self,
+        func: Callable[[T_ACCUMULATE, T_SOURCE], T_ACCUMULATE],
+        seed: T_ACCUMULATE = _MISSING,
+    ) -> T_ACCUMULATE:
+        return aggregate(self, func, seed)
+
+    def sum(self, selector: Optional[Callable[[T_SOURCE], Any]] = None) -> Any:
+        return sum(self, selector)
+
+    def min_by(self, selector: Callable[[T_SOURCE], Any]) -> Optional[T_SOURCE]:
+        return min_by(self, selector)
+
+    def max_by(self, selector: Callable[[T_SOURCE], Any]) -> Optional[T_SOURCE]:
+        return max_by(self, selector)
+
+    def memoize(self) -> "linq[T_SOURCE]":
+        return linq(memoize(self), self.__sorted)
+
+    def materialize(self, typecode: Optional[str] = None) -> "linq[T_SOURCE]":
+        return linq(materialize(self, typecode), self.__sorted)
 
     def as_list(self) -> list[T_SOURCE]:
         return as_list(self)
 
+    def to_numpy(self, dtype: Any = None) -> Any:
+        return to_numpy(self, dtype)
+
+    @property
+    def __sorted(self) -> capability:
+        return self.capabilities & capability.sorted
+
+
+def _detect(src: Iterable[Any]) -> capability:
+    if isinstance(src, Iterator):
+        return capability.none
+    if isinstance(src, linq):
+        return src.capabilities
+    if isinstance(src, _selected):
+        return src.caps
+
+    caps = capability.none
+    if isinstance(src, Sized):
+        caps |= capability.sized
+    if isinstance(src, Sequence) or getattr(src, "ndim", 0) > 0:
+        caps |= _SEQUENCE
+    elif isinstance(src, Reversible):
+        caps |= capability.reversible
+    if isinstance(src, _range) and src.step > 0:
+        caps |= capability.sorted
+    return caps
+
+
+def _inspect(src: Iterable[T_SOURCE]) -> tuple[Iterable[T_SOURCE], capability]:
+    if isinstance(src, linq):
+        return src._unwrap()
+    return src, _detect(src)
+
+
+def _identity(e: T_SOURCE) -> T_SOURCE:
+    return e
+
+
+class _selected(Generic[T_SOURCE, T_RESULT]):
+    """`select` over a sized source, keeping its len/indexing/reversal"""
+
+    __slots__ = ("src", "selector", "caps")
+
+    def __init__(
+        self,
+        src: Any,
+        selector: Callable[[T_SOURCE], T_RESULT],
+        caps: capability,
+    ) -> None:
+        self.src = src
+        self.selector = selector
+        self.caps = caps & _SEQUENCE
+
+    def __len__(self) -> int:
+        return len(self.src)
+
+    def __iter__(self) -> Iterator[T_RESULT]:
+        return map(self.selector, self.src)
+
+    def __reversed__(self) -> Iterator[T_RESULT]:
+        return map(self.selector, reversed(self.src))
+
+    def __getitem__(self, i: int) -> T_RESULT:
+        return self.selector(self.src[i])
+
+
+class _sliced(Sequence[T_SOURCE]):
+    """`take`/`skip` window over an indexable source, without copying"""
+
+    __slots__ = ("src", "indices")
+
+    def __init__(self, src: Any, indices: _range) -> None:
+        self.src = src
+        self.indices = indices
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def __iter__(self) -> Iterator[T_SOURCE]:
+        return map(self.src.__getitem__, self.indices)
+
+    def __reversed__(self) -> Iterator[T_SOURCE]:
+        return map(self.src.__getitem__, reversed(self.indices))
+
+    def __getitem__(self, i):  # type: ignore[override]
+        if isinstance(i, slice):
+            return _sliced(self.src, self.indices[i])
+        return self.src[self.indices[i]]
+
+
+class _repeated(Sequence[T_SOURCE]):
+    """`count` copies of `value`, stored once"""
+
+    __slots__ = ("value", "count")
+
+    def __init__(self, value: T_SOURCE, count: int) -> None:
+        self.value = value
+        self.count = _max(0, count)  # type: ignore[misc]
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[T_SOURCE]:
+        return _repeat(self.value, self.count)
+
+    def __reversed__(self) -> Iterator[T_SOURCE]:
+        return _repeat(self.value, self.count)
+
+    def __contains__(self, value: object) -> bool:
+        return self.count > 0 and (value is self.value or value == self.value)
+
+    def __getitem__(self, i):  # type: ignore[override]
+        if isinstance(i, slice):
+            return _repeated(self.value, len(_range(self.count)[i]))
+        if not -self.count <= i < self.count:
+            raise IndexError("index out of range")
+        return self.value
+
+    def __repr__(self) -> str:
+        return f"repeat({self.value!r}, {self.count})"
+
+
+def _slice(seq: Any, start: int, stop: Optional[int]) -> Iterable[Any]:
+    if isinstance(seq, (_range, _sliced, _repeated)):
+        return seq[start:stop]
+    return _sliced(seq, _range(len(seq))[start:stop])
+
+
+_SortKeys = tuple[tuple[Callable[[Any], Any], bool], ...]
+
+
+class _sort_key:
+    __slots__ = ("keys", "descending")
+
+    def __init__(self, keys: tuple, descending: tuple[bool, ...]) -> None:
+        self.keys = keys
+        self.descending = descending
+
+    def __lt__(self, other: "_sort_key") -> bool:
+        for a, b, desc in _zip(self.keys, other.keys, self.descending):
+            if a < b:
+                return not desc
+            if b < a:
+                return desc
+        return False
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _sort_key) and self.keys == other.keys
+
+
+class ordered_linq(linq[T_SOURCE]):
+    """
+    sorted view over `src`, evaluated on iteration
+
+    ```python
+    linq(users).order_by(lambda u: u.age).then_by(lambda u: u.name).take(10)
+    ```
+
+    every key selector runs once per element. `take(k)` keeps a bounded heap
+    (O(n log k)) instead of sorting everything, and `run_size` spills sorted
+    runs of that many elements to temporary files and merges them lazily;
+    elements and their keys must then be picklable (a TypeError is raised
+    when the first run is spilled otherwise).
+    """
+
+    def __init__(
+        self,
+        src: Iterable[T_SOURCE],
+        keys: _SortKeys,
+        run_size: Optional[int] = None,
+    ) -> None:
+        if run_size is not None and run_size <= 0:
+            raise ValueError("run_size must be positive")
+        super().__init__(src)
+        self.__source = src
+        self.__keys = keys
+        self.__run_size = run_size
+
+    @property
+    def capabilities(self) -> capability:
+        if self.__keys[0] == (_identity, False):
+            return capability.sorted
+        return capability.none
+
+    def _unwrap(self) -> tuple[Iterable[T_SOURCE], capability]:
+        return self, self.capabilities
+
+    def __iter__(self) -> Iterator[T_SOURCE]:
+        if self.__run_size is None:
+            return iter(self.__sort(self.__source))
+        return self.__external_sort()
+
+    def then_by(
+        self,
+        selector: Callable[[T_SOURCE], Any],
+        descending: bool = False,
+    ) -> "ordered_linq[T_SOURCE]":
+        return ordered_linq(
+            self.__source,
+            self.__keys + ((selector, descending),),
+            self.__run_size,
+        )
+
+    def count(self, pred: Optional[Callable[[T_SOURCE], bool]] = None) -> int:
+        return count(self.__source, pred)
+
+    def any(self, pred: Optional[Callable[[T_SOURCE], bool]] = None) -> bool:
+        return any(self.__source, pred)
+
+    def take(self, count: int) -> "linq[T_SOURCE]":
+        return linq(self.__top(self.__source, count), self.capabilities)
+
+    def first(
+        self,
+        pred: Optional[Callable[[T_SOURCE], bool]] = None,
+    ) -> Optional[T_SOURCE]:
+        src = self.__source if pred is None else where(self.__source, pred)
+        return first(self.__top(src, 1))
+
+    def __records(self, src: Iterable[T_SOURCE]) -> Iterator[tuple[tuple, T_SOURCE]]:
+        selectors = [selector for selector, _ in self.__keys]
+        return ((tuple(s(e) for s in selectors), e) for e in src)
+
+    def __record_key(self) -> tuple[Callable[[Any], Any], bool]:
+        """key and `reverse` flag ordering `(keys, item)` records"""
+        descending = tuple(desc for _, desc in self.__keys)
+        if self.__uniform:
+            return itemgetter(0), descending[0]
+        return (lambda r: _sort_key(r[0], descending)), False
+
+    @property
+    def __uniform(self) -> bool:
+        return len({desc for _, desc in self.__keys}) == 1
+
+    def __sort(self, src: Iterable[T_SOURCE]) -> list[T_SOURCE]:
+        if len(self.__keys) == 1:
+            selector, descending = self.__keys[0]
+            items = list(src)
+            items.sort(key=selector, reverse=descending)
+            return items
+
+        return [e for _, e in self.__sort_records(list(self.__records(src)))]
+
+    def __sort_records(self, records: list[tuple[tuple, T_SOURCE]]) -> list:
+        if self.__uniform:
+            records.sort(key=itemgetter(0), reverse=self.__keys[0][1])
+            return records
+
+        # mixed directions: stable passes from the least significant key
+        for level in reversed(_range(len(self.__keys))):
+            records.sort(key=lambda r: r[0][level], reverse=self.__keys[level][1])
+        return records
+
+    def __top(self, src: Iterable[T_SOURCE], count: int) -> Iterator[T_SOURCE]:
+        if count <= 0:
+            return
+        if len(self.__keys) == 1:
+            selector, descending = self.__keys[0]
+            pick = heapq.nlargest if descending else heapq.nsmallest
+            yield from pick(count, src, key=selector)
+            return
+
+        key, reverse = self.__record_key()
+        pick = heapq.nlargest if reverse else heapq.nsmallest
+        for _, e in pick(count, self.__records(src), key=key):
+            yield e
+
+    def __external_sort(self) -> Iterator[T_SOURCE]:
+        assert self.__run_size is not None
+        runs: list[IO[bytes]] = []
+        try:
+            records = self.__records(self.__source)
+            while batch := list(islice(records, self.__run_size)):
+                self.__sort_records(batch)
+                if not runs and len(batch) < self.__run_size:
+                    # everything fit in memory, nothing to spill
+                    for _, e in batch:
+                        yield e
+                    return
+                runs.append(_spill(batch))
+
+            key, reverse = self.__record_key()
+            for _, e in heapq.merge(
+                *(_load(run) for run in runs), key=key, reverse=reverse
+            ):
+                yield e
+        finally:
+            for run in runs:
+                run.close()
+
+
+def _spill(records: list, block_size: int = 4096) -> IO[bytes]:
+    fp = tempfile.TemporaryFile()
+    try:
+        for i in _range(0, len(records), block_size):
+            pickle.dump(records[i : i + block_size], fp, pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, AttributeError, TypeError) as e:
+        fp.close()
+        raise TypeError(
+            f"order_by(run_size=...) requires picklable elements and keys: {e}"
+        ) from e
+    fp.seek(0)
+    return fp
+
+
+def _load(fp: IO[bytes]) -> Iterator:
+    while True:
+        try:
+            block = pickle.load(fp)
+        except EOFError:
+            return
+        yield from block
+
 
 def count(
     src: Iterable[T_SOURCE],
     pred: Optional[Callable[[T_SOURCE], bool]] = None,
 ) -> int:
+    if pred is None:
+        seq, caps = _inspect(src)
+        if caps & capability.sized:
+            return len(seq)  # type: ignore
     if pred:
-        return sum(1 for e in src if pred(e))
+        return _sum(1 for e in src if pred(e))
     else:
-        return sum(1 for _ in src)
+        return _sum(1 for _ in src)
 
 
 def any(
     src: Iterable[T_SOURCE],
     pred: Optional[Callable[[T_SOURCE], bool]] = None,
 ) -> bool:
+    if pred is None:
+        seq, caps = _inspect(src)
+        if caps & capability.sized:
+            return len(seq) > 0  # type: ignore
     for e in src:
         if (not pred) or (pred and pred(e)):
             return True
@@ -110,9 +554,26 @@ def select(
     src: Iterable[T_SOURCE],
     pred: Callable[[T_SOURCE], T_RESULT],
 ) -> Iterable[T_RESULT]:
+    seq, caps = _inspect(src)
+    if caps & capability.sized:
+        return _selected(seq, pred, caps)
     return iter(pred(e) for e in src)
 
 
+def contains(src: Iterable[T_SOURCE], value: object) -> bool:
+    seq, caps = _inspect(src)
+    if (
+        caps & capability.sorted
+        and caps & capability.indexable
+        and not isinstance(seq, _range)
+    ):
+        i = bisect_left(seq, value)  # type: ignore
+        return i < len(seq) and seq[i] == value  # type: ignore
+    if isinstance(seq, Container) and not isinstance(seq, linq):
+        return value in seq
+    return _any(e == value for e in seq)
+
+
 def zip(
     src: Iterable[T_SOURCE],
     other: Iterable[T_ZIP_OUTER],
@@ -145,45 +606,305 @@ def first(
     src: Iterable[T_SOURCE],
     pred: Optional[Callable[[T_SOURCE], bool]] = None,
 ) -> Optional[T_SOURCE]:
+    if pred is None:
+        seq, caps = _inspect(src)
+        if caps & capability.indexable:
+            return seq[0] if len(seq) else None  # type: ignore
     for e in src:
         if pred is None or pred(e):
             return e
     return None
 
 
-def last(self, pred: Optional[Callable[[T_SOURCE], bool]] = None) -> T_SOURCE:
-    if pred is None:
-        try:
-            return next(reversed(self.__src))  # type: ignore
-        except (TypeError, StopIteration) as e:
-            raise e
+def last(
+    src: Iterable[T_SOURCE],
+    pred: Optional[Callable[[T_SOURCE], bool]] = None,
+) -> T_SOURCE:
+    seq, caps = _inspect(src)
+    if caps & capability.reversible:
+        for e in reversed(seq):  # type: ignore
+            if pred is None or pred(e):
+                return e
+        raise ValueError("No matching element")
 
     last_item = None
     found = False
-    for e in self:
+    for e in src:
         if pred is None or pred(e):
             last_item = e
             found = True
 
     if not found:
-        raise ValueError()
+        raise ValueError("No matching element")
     return last_item  # type: ignore
 
 
 def order_by(
     src: Iterable[T_SOURCE],
-    selector: Callable[[T_SOURCE], Any],
+    selector: Optional[Callable[[T_SOURCE], Any]] = None,
     descending: bool = False,
+    *,
+    run_size: Optional[int] = None,
+) -> "ordered_linq[T_SOURCE]":
+    return ordered_linq(src, ((selector or _identity, descending),), run_size)
+
+
+def take(src: Iterable[T_SOURCE], count: int) -> Iterable[T_SOURCE]:
+    seq, caps = _inspect(src)
+    if caps & capability.indexable:
+        return _slice(seq, 0, _max(0, count))
+    return islice(src, _max(0, count))
+
+
+def skip(src: Iterable[T_SOURCE], count: int) -> Iterable[T_SOURCE]:
+    seq, caps = _inspect(src)
+    if caps & capability.indexable:
+        return _slice(seq, _max(0, count), None)
+    return islice(src, _max(0, count), None)
+
+
+def take_while(
+    src: Iterable[T_SOURCE],
+    pred: Callable[[T_SOURCE], bool],
+) -> Iterable[T_SOURCE]:
+    return takewhile(pred, src)
+
+
+def skip_while(
+    src: Iterable[T_SOURCE],
+    pred: Callable[[T_SOURCE], bool],
 ) -> Iterable[T_SOURCE]:
+    return dropwhile(pred, src)
+
+
+class linq_sequence(linq[T_SOURCE]):
+    """
+    `linq` over a sequence that stays a sequence itself: `len`, indexing,
+    slicing and `reversed` go straight to the source. returned by `range`
+    and `repeat`.
+    """
+
+    def __init__(
+        self,
+        src: Sequence[T_SOURCE],
+        caps: capability = capability.none,
+    ) -> None:
+        super().__init__(src, caps)
+        self.__seq = src
+
+    def __len__(self) -> int:
+        return len(self.__seq)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            ascending = i.step is None or i.step > 0
+            caps = self.capabilities & capability.sorted if ascending else capability.none
+            return linq_sequence(self.__seq[i], caps)
+        return self.__seq[i]
+
+    def __reversed__(self) -> Iterator[T_SOURCE]:
+        return reversed(self.__seq)
+
+
+class _bloom:
+    """fixed-size Bloom filter; `add` reports whether the key was (probably) seen"""
+
+    __slots__ = ("bits", "size", "hashes")
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+        size = math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        self.size = _max(8, size)
+        self.hashes = _max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def add(self, key: Any) -> bool:
+        h1 = hash(key) & 0xFFFFFFFFFFFFFFFF
+        h2 = ((h1 * 0x9E3779B97F4A7C15) >> 32 | 1) & 0xFFFFFFFFFFFFFFFF
+        bits = self.bits
+        seen = True
+        for i in _range(self.hashes):
+            idx = (h1 + i * h2) % self.size
+            mask = 1 << (idx & 7)
+            if not bits[idx >> 3] & mask:
+                bits[idx >> 3] |= mask
+                seen = False
+        return seen
+
+
+def distinct(
+    src: Iterable[T_SOURCE],
+    selector: Optional[Callable[[T_SOURCE], Any]] = None,
+    *,
+    capacity: Optional[int] = None,
+    error_rate: float = 0.01,
+) -> Iterable[T_SOURCE]:
+    """
+    with `capacity`, seen keys are tracked in a Bloom filter of fixed size
+    instead of a set; about `error_rate` of the unique elements may then be
+    dropped as false duplicates once `capacity` keys have been seen.
+    """
+    if capacity is None and selector is None:
+        seq, caps = _inspect(src)
+        if isinstance(seq, _repeated):
+            return seq[:1]
+        if caps & capability.sorted:
+            # equal elements are adjacent, no need to remember them
+            return (k for k, _ in groupby(seq))
+
+    if capacity is not None:
+        seen_bloom = _bloom(capacity, error_rate)
+
+        def bounded():
+            for e in src:
+                if not seen_bloom.add(e if selector is None else selector(e)):
+                    yield e
+
+        return bounded()
+
     def generator():
-        items = list(src)
-        items.sort(key=selector, reverse=descending)
-        for item in items:
-            yield item
+        seen = set()
+        add = seen.add
+        for e in src:
+            k = e if selector is None else selector(e)
+            if k not in seen:
+                add(k)
+                yield e
 
     return generator()
 
 
+def select_many(
+    src: Iterable[T_SOURCE],
+    selector: Callable[[T_SOURCE], Iterable[T_RESULT]],
+) -> Iterable[T_RESULT]:
+    return chain.from_iterable(selector(e) for e in src)
+
+
+def concat(src: Iterable[T_SOURCE], *others: Iterable[T_SOURCE]) -> Iterable[T_SOURCE]:
+    return chain(src, *others)
+
+
+def chunk(src: Iterable[T_SOURCE], size: int) -> Iterable[list[T_SOURCE]]:
+    if size <= 0:
+        raise ValueError("size must be positive")
+
+    def generator():
+        it = iter(src)
+        while batch := list(islice(it, size)):
+            yield batch
+
+    return generator()
+
+
+def window(src: Iterable[T_SOURCE], size: int) -> Iterable[tuple[T_SOURCE, ...]]:
+    if size <= 0:
+        raise ValueError("size must be positive")
+
+    def generator():
+        it = iter(src)
+        buffer = deque(islice(it, size), maxlen=size)
+        if len(buffer) < size:
+            return
+        yield tuple(buffer)
+        for e in it:
+            buffer.append(e)
+            yield tuple(buffer)
+
+    return generator()
+
+
+def aggregate(
+    src: Iterable[T_SOURCE],
+    func: Callable[[T_ACCUMULATE, T_SOURCE], T_ACCUMULATE],
+    seed: T_ACCUMULATE = _MISSING,
+) -> T_ACCUMULATE:
+    it = iter(src)
+    if seed is _MISSING:
+        try:
+            seed = next(it)  # type: ignore
+        except StopIteration:
+            raise ValueError("aggregate of empty sequence with no seed") from None
+    return reduce(func, it, seed)
+
+
+def sum(
+    src: Iterable[T_SOURCE],
+    selector: Optional[Callable[[T_SOURCE], Any]] = None,
+) -> Any:
+    if selector is None:
+        return _sum(src)  # type: ignore
+    return _sum(selector(e) for e in src)
+
+
+def min_by(
+    src: Iterable[T_SOURCE],
+    selector: Callable[[T_SOURCE], Any],
+) -> Optional[T_SOURCE]:
+    return _min(src, key=selector, default=None)
+
+
+def max_by(
+    src: Iterable[T_SOURCE],
+    selector: Callable[[T_SOURCE], Any],
+) -> Optional[T_SOURCE]:
+    return _max(src, key=selector, default=None)
+
+
+class _memoized(Generic[T_SOURCE]):
+    """
+    replayable view of `src`: elements are pulled from upstream once, on first
+    demand, and buffered for every iterator (including interleaved ones)
+    """
+
+    def __init__(self, src: Iterable[T_SOURCE]) -> None:
+        self.__source: Optional[Iterator[T_SOURCE]] = iter(src)
+        self.__buffer: list[T_SOURCE] = []
+        self.__lock = threading.Lock()
+
+    def __iter__(self) -> Iterator[T_SOURCE]:
+        buffer = self.__buffer
+        i = 0
+        while True:
+            if i < len(buffer):
+                yield buffer[i]
+                i += 1
+            elif not self.__pull(i):
+                return
+
+    def __pull(self, i: int) -> bool:
+        with self.__lock:
+            if i < len(self.__buffer):
+                return True
+            if self.__source is None:
+                return False
+            try:
+                self.__buffer.append(next(self.__source))
+            except StopIteration:
+                self.__source = None
+                return False
+            return True
+
+
+def memoize(src: Iterable[T_SOURCE]) -> Iterable[T_SOURCE]:
+    if isinstance(src, _memoized):
+        return src
+    return _memoized(src)
+
+
+def materialize(
+    src: Iterable[T_SOURCE],
+    typecode: Optional[str] = None,
+) -> list[T_SOURCE] | array:
+    """snapshot `src` into a list, or into a typed `array.array` if `typecode` is given"""
+    if typecode is None:
+        return list(src)
+    return array(typecode, src)  # type: ignore
+
+
 def as_linq(src: Iterable[T_SOURCE]) -> linq[T_SOURCE]:
     return linq(src)
 
@@ -192,9 +913,26 @@ def as_list(src: Iterable[T_SOURCE]) -> list[T_SOURCE]:
     return list(src)
 
 
-def repeat(e: T_SOURCE, count: int) -> linq[T_SOURCE]:
-    return linq(e for _ in _range(count))
+def to_numpy(src: Iterable[T_SOURCE], dtype: Any = None) -> Any:
+    """`numpy.ndarray` of `src`; `range` and `repeat` sources are built without iterating"""
+    import numpy as np
+
+    seq, caps = _inspect(src)
+    if isinstance(seq, _range):
+        return np.arange(seq.start, seq.stop, seq.step, dtype=dtype)
+    if isinstance(seq, _repeated):
+        return np.full(len(seq), seq.value, dtype=dtype)
+    if isinstance(seq, np.ndarray):
+        return seq if dtype is None else seq.astype(dtype, copy=False)
+    if dtype is not None:
+        count = len(seq) if caps & capability.sized else -1  # type: ignore
+        return np.fromiter(seq, dtype=dtype, count=count)
+    return np.array(list(seq))
+
+
+def repeat(e: T_SOURCE, count: int) -> linq_sequence[T_SOURCE]:
+    return linq_sequence(_repeated(e, count), capability.sorted)
 
 
-def range(start: int, count: int) -> linq[int]:
-    return linq(i for i in _range(start, start + count))
+def range(start: int, count: int) -> linq_sequence[int]:
+    return linq_sequence(_range(start, start + _max(0, count)))
@@ -1,12 +1,22 @@
+import asyncio
 import time
-from typing import Callable, Generic, TypeVar
-from .delegate import action
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Generic, Iterator, Optional, TypeVar
+from weakref import WeakSet
+from .delegate import action, subscription
 from .readonly import readonly
 
 T = TypeVar("T")
+U = TypeVar("U")
+
+# sources read by the `Computed` currently evaluating in this thread/task, if any
+_tracking: ContextVar[Optional[set[Any]]] = ContextVar("_tracking", default=None)
 
 
 class RxEvent(Generic[T]):
+    __slots__ = ("__pre", "__post")
+
     def __init__(self, pre: T, post: T) -> None:
         self.__pre = pre
         self.__post = post
@@ -21,12 +31,46 @@ class RxEvent(Generic[T]):
 
 
 class ReactiveProperty(Generic[T]):
+    """
+    slotted so that large numbers of cells stay small; the subscriber list is
+    only created by the first subscription, and no `RxEvent` is allocated for
+    a change nobody listens to.
+    """
+
+    __slots__ = (
+        "__value",
+        "__batch_depth",
+        "__batch_pre",
+        "__batch_effects",
+        "__detach",
+        "__on_changed",
+        "_dependents",
+        "__weakref__",
+    )
+
     def __init__(self, value: T) -> None:
         self.__value = value
-        self.on_changed = action[RxEvent[T]]()
+        self.__batch_depth = 0
+        self.__batch_pre: Optional[T] = None
+        self.__batch_effects: Optional[list[Computed[Any]]] = None
+        self.__detach: Optional[list[Callable[[], Any]]] = None
+        self.__on_changed: Optional[action[RxEvent[T]]] = None
+        self._dependents: Optional[WeakSet[Computed[Any]]] = None
+
+    @property
+    def on_changed(self) -> action[RxEvent[T]]:
+        if self.__on_changed is None:
+            self.__on_changed = action[RxEvent[T]]()
+        return self.__on_changed
+
+    @on_changed.setter
+    def on_changed(self, handlers: action[RxEvent[T]]) -> None:
+        self.__on_changed = handlers
 
     @property
     def value(self) -> T:
+        if (tracking := _tracking.get()) is not None:
+            tracking.add(self)
         return self.__value
 
     @value.setter
@@ -34,30 +78,462 @@ class ReactiveProperty(Generic[T]):
         if self.__value != new_value:
             pre_value = self.__value
             self.__value = new_value
-            self.on_changed.invoke(RxEvent(pre_value, new_value))
+            if self.__batch_depth:
+                if self._dependents:
+                    self.__batch_effects += _invalidate(self._dependents)
+                return
+            if self._dependents:
+                _refresh(_invalidate(self._dependents))
+            if self.__on_changed:
+                self.__on_changed.invoke(RxEvent(pre_value, new_value))
+
+    @contextmanager
+    def batch(self) -> Iterator["ReactiveProperty[T]"]:
+        """
+        suppress notifications inside the block and emit one
+        `RxEvent(first_pre, last_new)` on exit, unless the value ended up
+        unchanged. batches nest; only the outermost one notifies.
+
+        dependent Computeds are marked dirty on every change, so reading them
+        inside the block is up to date; their subscribers run once on exit.
+        """
+        if not self.__batch_depth:
+            self.__batch_pre = self.__value
+            self.__batch_effects = []
+        self.__batch_depth += 1
+        try:
+            yield self
+        finally:
+            self.__batch_depth -= 1
+            if not self.__batch_depth:
+                pre_value, self.__batch_pre = self.__batch_pre, None
+                effects, self.__batch_effects = self.__batch_effects, None
+                if effects:
+                    _refresh(effects)
+                if pre_value != self.__value and self.__on_changed:
+                    self.__on_changed.invoke(RxEvent(pre_value, self.__value))
+
+    def throttle(self, seconds: float) -> "ReactiveProperty[T]":
+        """
+        a property following this one at most once per `seconds`: the first
+        change passes through, later ones collapse into the latest value at
+        the end of the window. timers run on the running asyncio loop.
+        """
+        loop = asyncio.get_running_loop()
+        derived = ReactiveProperty(self.__value)
+        handle: Optional[asyncio.TimerHandle] = None
+
+        def window_closed() -> None:
+            nonlocal handle
+            if derived.__value != self.__value:
+                derived.value = self.__value
+                handle = loop.call_later(seconds, window_closed)
+            else:
+                handle = None
+
+        def on_changed(e: RxEvent[T]) -> None:
+            nonlocal handle
+            if handle is None:
+                derived.value = e.new
+                handle = loop.call_later(seconds, window_closed)
+
+        def detach() -> None:
+            if handle is not None:
+                handle.cancel()
+
+        return self.__derive(derived, on_changed, detach)
+
+    def debounce(self, seconds: float) -> "ReactiveProperty[T]":
+        """a property taking this one's value once it has been quiet for `seconds`"""
+        loop = asyncio.get_running_loop()
+        derived = ReactiveProperty(self.__value)
+        handle: Optional[asyncio.TimerHandle] = None
+
+        def settle() -> None:
+            derived.value = self.__value
+
+        def on_changed(_: RxEvent[T]) -> None:
+            nonlocal handle
+            if handle is not None:
+                handle.cancel()
+            handle = loop.call_later(seconds, settle)
+
+        def detach() -> None:
+            if handle is not None:
+                handle.cancel()
+
+        return self.__derive(derived, on_changed, detach)
+
+    def sample(self, seconds: float) -> "ReactiveProperty[T]":
+        """a property that copies this one's value every `seconds`"""
+        loop = asyncio.get_running_loop()
+        derived = ReactiveProperty(self.__value)
+        handle: Optional[asyncio.TimerHandle] = None
+
+        def tick() -> None:
+            nonlocal handle
+            derived.value = self.__value
+            handle = loop.call_later(seconds, tick)
+
+        def detach() -> None:
+            if handle is not None:
+                handle.cancel()
+
+        handle = loop.call_later(seconds, tick)
+        return self.__derive(derived, None, detach)
+
+    def __derive(
+        self,
+        derived: "ReactiveProperty[T]",
+        on_changed: Optional[Callable[[RxEvent[T]], None]],
+        detach: Callable[[], None],
+    ) -> "ReactiveProperty[T]":
+        derived.__detach = [detach]
+        if on_changed is not None:
+            derived.__detach.append(self.on_changed.register(on_changed).dispose)
+        return derived
 
     def subscribe(
         self,
         cb: Callable[[RxEvent[T]], None],
         immediate: bool = False,
+        weak: bool = False,
     ) -> None:
-        self.on_changed.register(cb)
+        if weak:
+            self.on_changed.register_weak(cb)
+        else:
+            self.on_changed.register(cb)
         if immediate:
             self.notify()
 
     def notify(self) -> None:
-        self.on_changed.invoke(RxEvent(self.__value, self.__value))
+        if self.__on_changed:
+            self.__on_changed.invoke(RxEvent(self.__value, self.__value))
 
     def as_readonly(self) -> "readonly[T]":
         return readonly(lambda: self.__value)
 
+    def as_observable(self) -> "Observable[T]":
+        """stream of new values; the property is subscribed while observed"""
+        return Observable(
+            lambda emit: self.on_changed.register(lambda e: emit(e.new)).dispose
+        )
+
     def dispose(self) -> None:
+        if self.__on_changed is not None:
+            self.__on_changed.clear()
+        while self.__detach:
+            self.__detach.pop()()
+
+    def __repr__(self) -> str:
+        return repr(self.value)
+
+
+class Computed(Generic[T]):
+    """
+    value derived by `fn` from the ReactiveProperties and Computeds it reads.
+    a change upstream only marks it dirty; it is recomputed on the next read,
+    or right away (once per change or batch) if it has subscribers. dirty
+    marking finishes before anything recomputes and subscribers are refreshed
+    in rank order, so a diamond dependency never sees a half-updated graph.
+
+    sources only hold weak references to it: keep a reference to a Computed
+    for as long as its subscribers should be notified.
+    """
+
+    def __init__(self, fn: Callable[[], T]) -> None:
+        self.__fn = fn
+        self.__value: T
+        self.__emitted: T
+        self.__dirty = True
+        self.__sources: set[Any] = set()
+        self._dependents: Optional[WeakSet[Computed[Any]]] = None
+        self._rank = 0
+        self.recomputes = 0
+        self.on_changed = action[RxEvent[T]]()
+
+    @property
+    def value(self) -> T:
+        if (tracking := _tracking.get()) is not None:
+            tracking.add(self)
+        if self.__dirty:
+            self.__recompute()
+        return self.__value
+
+    @property
+    def dirty(self) -> bool:
+        return self.__dirty
+
+    def subscribe(
+        self,
+        cb: Callable[[RxEvent[T]], None],
+        immediate: bool = False,
+    ) -> subscription:
+        if self.__dirty:
+            self.__recompute()
+        handle = self.on_changed.register(cb)
+        if immediate:
+            cb(RxEvent(self.__value, self.__value))
+        return handle
+
+    def __recompute(self) -> None:
+        sources: set[Any] = set()
+        token = _tracking.set(sources)
+        try:
+            value = self.__fn()
+        finally:
+            _tracking.reset(token)
+        for src in self.__sources - sources:
+            src._dependents.discard(self)
+        for src in sources - self.__sources:
+            if src._dependents is None:
+                src._dependents = WeakSet()
+            src._dependents.add(self)
+        self.__sources = sources
+        self._rank = 1 + max((getattr(s, "_rank", 0) for s in sources), default=0)
+        self.__value = value
+        if not self.on_changed:
+            self.__emitted = value
+        self.__dirty = False
+        self.recomputes += 1
+
+    def _invalidate(self, effects: list["Computed[Any]"]) -> None:
+        if self.__dirty:
+            return
+        self.__dirty = True
+        if len(self.on_changed):
+            effects.append(self)
+        if self._dependents:
+            for dependent in tuple(self._dependents):
+                dependent._invalidate(effects)
+
+    def _refresh(self) -> None:
+        """notify subscribers if the value differs from the last one they saw"""
+        if self.__dirty:
+            self.__recompute()
+        if self.__emitted != self.__value:
+            pre_value, self.__emitted = self.__emitted, self.__value
+            self.on_changed.invoke(RxEvent(pre_value, self.__value))
+
+    def dispose(self) -> None:
+        for src in self.__sources:
+            src._dependents.discard(self)
+        self.__sources = set()
+        self.__dirty = True
         self.on_changed.clear()
 
     def __repr__(self) -> str:
         return repr(self.value)
 
 
+def computed(fn: Callable[[], T]) -> Computed[T]:
+    """`Computed(fn)`, usable as a decorator"""
+    return Computed(fn)
+
+
+def _invalidate(dependents: WeakSet[Computed[Any]]) -> list[Computed[Any]]:
+    """mark `dependents` dirty; returns those with subscribers to refresh"""
+    effects: list[Computed[Any]] = []
+    for dependent in tuple(dependents):
+        dependent._invalidate(effects)
+    return effects
+
+
+def _refresh(effects: list[Computed[Any]]) -> None:
+    effects.sort(key=lambda c: c._rank)
+    for effect in effects:
+        effect._refresh()
+
+
+class _multicast(action[T]):
+    """observer list that reports when its last observer leaves"""
+
+    __slots__ = ("__on_empty",)
+
+    def __init__(self, on_empty: Callable[[], None]) -> None:
+        super().__init__()
+        self.__on_empty = on_empty
+
+    def _remove(self, callback: Callable[..., Any]) -> None:
+        super()._remove(callback)
+        if not len(self):
+            self.__on_empty()
+
+    def _discard(self, keys: tuple[int, ...]) -> None:
+        super()._discard(keys)
+        if not len(self):
+            self.__on_empty()
+
+
+class Observable(Generic[T]):
+    """
+    hot, refcounted stream. `connect(emit)` subscribes upstream and returns a
+    teardown; it runs when the first observer arrives and is torn down when
+    the last one leaves, so every operator stage runs once per value however
+    many observers share it.
+    """
+
+    def __init__(
+        self, connect: Callable[[Callable[[T], None]], Callable[[], None]]
+    ) -> None:
+        self.__connect = connect
+        self.__disconnect: Optional[Callable[[], None]] = None
+        self.__observers = _multicast[T](self.__release)
+
+    @property
+    def connected(self) -> bool:
+        return self.__disconnect is not None
+
+    def subscribe(self, cb: Callable[[T], None]) -> subscription:
+        handle = self.__observers.register(cb)
+        if self.__disconnect is None:
+            self.__disconnect = self.__connect(self.__observers.invoke)
+        return handle
+
+    def __release(self) -> None:
+        if self.__disconnect is not None:
+            disconnect, self.__disconnect = self.__disconnect, None
+            disconnect()
+
+    def map(self, selector: Callable[[T], U]) -> "Observable[U]":
+        return Observable(
+            lambda emit: self.subscribe(lambda v: emit(selector(v))).dispose
+        )
+
+    def where(self, predicate: Callable[[T], bool]) -> "Observable[T]":
+        def connect(emit: Callable[[T], None]) -> Callable[[], None]:
+            def on_next(v: T) -> None:
+                if predicate(v):
+                    emit(v)
+
+            return self.subscribe(on_next).dispose
+
+        return Observable(connect)
+
+    def distinct_until_changed(self) -> "Observable[T]":
+        def connect(emit: Callable[[T], None]) -> Callable[[], None]:
+            last: list[T] = []
+
+            def on_next(v: T) -> None:
+                if not last:
+                    last.append(v)
+                elif last[0] != v:
+                    last[0] = v
+                else:
+                    return
+                emit(v)
+
+            return self.subscribe(on_next).dispose
+
+        return Observable(connect)
+
+    def scan(self, func: Callable[[U, T], U], seed: U) -> "Observable[U]":
+        def connect(emit: Callable[[U], None]) -> Callable[[], None]:
+            acc = seed
+
+            def on_next(v: T) -> None:
+                nonlocal acc
+                acc = func(acc, v)
+                emit(acc)
+
+            return self.subscribe(on_next).dispose
+
+        return Observable(connect)
+
+    def buffer(
+        self, count: Optional[int] = None, seconds: Optional[float] = None
+    ) -> "Observable[list[T]]":
+        """
+        emit values in lists of `count`, or every `seconds` if anything was
+        buffered (timers run on the running asyncio loop); with both, whichever
+        comes first.
+        """
+        if count is None and seconds is None:
+            raise ValueError("buffer requires count or seconds")
+        if count is not None and count < 1:
+            raise ValueError("count must be positive")
+
+        def connect(emit: Callable[[list[T]], None]) -> Callable[[], None]:
+            items: list[T] = []
+            handle: Optional[asyncio.TimerHandle] = None
+
+            def flush() -> None:
+                nonlocal items
+                if items:
+                    batch, items = items, []
+                    emit(batch)
+
+            def tick() -> None:
+                nonlocal handle
+                flush()
+                handle = loop.call_later(seconds, tick)
+
+            def on_next(v: T) -> None:
+                items.append(v)
+                if len(items) == count:
+                    flush()
+
+            if seconds is not None:
+                loop = asyncio.get_running_loop()
+                handle = loop.call_later(seconds, tick)
+            upstream = self.subscribe(on_next)
+
+            def disconnect() -> None:
+                upstream.dispose()
+                if handle is not None:
+                    handle.cancel()
+
+            return disconnect
+
+        return Observable(connect)
+
+    def merge(self, *others: "Observable[T]") -> "Observable[T]":
+        return merge(self, *others)
+
+    def combine_latest(self, *others: "Observable[Any]") -> "Observable[tuple]":
+        return combine_latest(self, *others)
+
+
+def _dispose_all(subscriptions: list[subscription]) -> None:
+    for s in subscriptions:
+        s.dispose()
+
+
+def merge(*sources: Observable[T]) -> Observable[T]:
+    """values from every source, in the order they arrive"""
+
+    def connect(emit: Callable[[T], None]) -> Callable[[], None]:
+        upstream = [src.subscribe(emit) for src in sources]
+        return lambda: _dispose_all(upstream)
+
+    return Observable(connect)
+
+
+def combine_latest(*sources: Observable[Any]) -> Observable[tuple]:
+    """tuple of the latest value of each source, once all of them have emitted"""
+
+    def connect(emit: Callable[[tuple], None]) -> Callable[[], None]:
+        missing = object()
+        latest = [missing] * len(sources)
+        waiting = len(sources)
+
+        def observer(i: int) -> Callable[[Any], None]:
+            def on_next(v: Any) -> None:
+                nonlocal waiting
+                if latest[i] is missing:
+                    waiting -= 1
+                latest[i] = v
+                if not waiting:
+                    emit(tuple(latest))
+
+            return on_next
+
+        upstream = [src.subscribe(observer(i)) for i, src in enumerate(sources)]
+        return lambda: _dispose_all(upstream)
+
+    return Observable(connect)
+
+
 if __name__ == "__main__":
     name = ReactiveProperty[str]("name0")
     name.subscribe(lambda e: print("changed from", e.pre, "to", e.new))
@@ -1,103 +1,467 @@
-from typing import Optional
+import warnings
+from random import random
+from string import Formatter
+from typing import Any, Callable, Iterator, Optional
 
+_LEAF = 512
 
-class _chunk:
-    def __init__(self, cap=16) -> None:
-        self.buffer: list[Optional[str]] = [None] * cap
-        self.count = 0
-        self.next: Optional[_chunk] = None
+_FORMATTER = Formatter()
+_CONVERSIONS = (None, "s", "r", "a")
+
+
+class format_template:
+    """
+    `str.format` template checked once up front and bound to `fmt.format`.
+
+    ```python
+    row = stringbuilder.compile_format("{name:<10}{:>8.2f}\\n")
+    sb.append_format(row, 3.14159, name="pi")
+    ```
+
+    malformed fields, unknown conversions and mixed automatic/manual field
+    numbering raise `ValueError` here instead of on first use.
+    """
+
+    __slots__ = ("fmt", "render")
+
+    def __init__(self, fmt: str) -> None:
+        auto = manual = False
+        for _, field, _, conversion in _FORMATTER.parse(fmt):
+            if field is None:
+                continue
+            if conversion not in _CONVERSIONS:
+                raise ValueError(f"Unknown conversion specifier {conversion}")
+            if field == "" or field[0] in ".[":
+                auto = True
+            elif field.split(".", 1)[0].split("[", 1)[0].isdigit():
+                manual = True
+            if auto and manual:
+                raise ValueError("cannot mix automatic and manual field numbering")
+        self.fmt = fmt
+        self.render: Callable[..., str] = fmt.format
+
+    def __call__(self, *args: object, **kwargs: object) -> str:
+        return self.render(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.fmt!r})"
+
+
+class _node:
+    """rope node (treap ordered by position, heap ordered by `priority`)"""
+
+    __slots__ = ("text", "length", "priority", "left", "right")
+
+    def __init__(self, text: str, priority: Optional[float] = None) -> None:
+        self.text = text
+        self.length = len(text)
+        self.priority = random() if priority is None else priority
+        self.left: Optional[_node] = None
+        self.right: Optional[_node] = None
+
+    def update(self) -> None:
+        self.length = (
+            len(self.text)
+            + (self.left.length if self.left else 0)
+            + (self.right.length if self.right else 0)
+        )
+
+
+def _build(pieces: list[str]) -> Optional[_node]:
+    """treap over `pieces` in O(len(pieces)), using the cartesian tree stack build"""
+    stack: list[_node] = []
+    for text in pieces:
+        node = _node(text)
+        last = None
+        while stack and stack[-1].priority < node.priority:
+            last = stack.pop()
+            last.update()
+        node.left = last
+        if stack:
+            stack[-1].right = node
+        stack.append(node)
+
+    root = stack[0] if stack else None
+    while stack:
+        stack.pop().update()
+    return root
+
+
+def _merge(a: Optional[_node], b: Optional[_node]) -> Optional[_node]:
+    if a is None:
+        return b
+    if b is None:
+        return a
+    if a.priority > b.priority:
+        a.right = _merge(a.right, b)
+        a.update()
+        return a
+    b.left = _merge(a, b.left)
+    b.update()
+    return b
+
+
+def _split(
+    t: Optional[_node], k: int
+) -> tuple[Optional[_node], Optional[_node]]:
+    """(first `k` characters, the rest)"""
+    if t is None:
+        return None, None
+
+    left_length = t.left.length if t.left else 0
+    if k <= left_length:
+        left, t.left = _split(t.left, k)
+        t.update()
+        return left, t
+
+    k -= left_length
+    if k >= len(t.text):
+        t.right, right = _split(t.right, k - len(t.text))
+        t.update()
+        return t, right
+
+    tail = _node(t.text[k:], t.priority)
+    tail.right = t.right
+    tail.update()
+    t.text = t.text[:k]
+    t.right = None
+    t.update()
+    return t, tail
+
+
+def _pieces(text: str) -> list[str]:
+    return [text[i : i + _LEAF] for i in range(0, len(text), _LEAF)]
 
 
 class stringbuilder:
-    def __init__(self, chunk_cap=16) -> None:
-        self.__chunk_cap = chunk_cap
-        self.__head = _chunk(self.__chunk_cap)
-        self.__tail = self.__head
+    """
+    appends are kept whole in a pending list and joined once by `str()`.
+
+    indexed operations (insert, remove, indexing, slicing) first move pending
+    text into a rope, a balanced tree of short segments with cached lengths,
+    so they run in O(log n) regardless of the document size.
+
+    the length is maintained on every mutation and `str()` is cached until the
+    next one, so repeated `len()`/`str()` calls are O(1).
+
+    `chunk_cap` is accepted for compatibility and ignored.
+    """
+
+    def __init__(self, chunk_cap: Optional[int] = None) -> None:
+        if chunk_cap is not None:
+            warnings.warn(
+                "stringbuilder(chunk_cap=...) has no effect and is deprecated",
+                DeprecationWarning,
+                stacklevel=2,
+            )
+        self.__root: Optional[_node] = None
+        self.__pending: list[str] = []
+        self.__length = 0
+        self.__text: Optional[str] = None
 
     def append(self, arg: object) -> None:
-        for c in str(arg):
-            if self.__tail.count >= self.__chunk_cap:
-                new_chunk = _chunk(self.__chunk_cap)
-                self.__tail.next = new_chunk
-                self.__tail = new_chunk
-            self.__tail.buffer[self.__tail.count] = c
-            self.__tail.count += 1
+        text = arg if type(arg) is str else str(arg)
+        if text:
+            self.__length += len(text)
+            self.__pending.append(text)
+            self.__text = None
+
+    @staticmethod
+    def compile_format(fmt: str) -> format_template:
+        return format_template(fmt)
+
+    def append_format(
+        self,
+        fmt: str | format_template,
+        *args: object,
+        **kwargs: object,
+    ) -> None:
+        if type(fmt) is format_template:
+            if text := fmt.render(*args, **kwargs):
+                self.__length += len(text)
+                self.__pending.append(text)
+                self.__text = None
+        else:
+            self.append(fmt.format(*args, **kwargs))  # type: ignore
 
-    def append_format(self, fmt: str, *args: object) -> None:
-        self.append(fmt.format(*args))
+    def appender(self, fmt: str | format_template) -> Callable[..., None]:
+        """
+        `append_format` bound to this builder and `fmt`, skipping the
+        per-call template dispatch and attribute lookups in hot loops.
+        """
+        if type(fmt) is not format_template:
+            fmt = format_template(fmt)
+        render = fmt.render
+        pending = self.__pending
+
+        def append_formatted(*args: object, **kwargs: object) -> None:
+            text = render(*args, **kwargs)
+            self.__length += len(text)
+            pending.append(text)
+            self.__text = None
+
+        return append_formatted
 
     def append_join(self, sep: str, *args: object) -> None:
         self.append(sep.join(str(a) for a in args))
 
     def append_line(self, arg: object) -> None:
-        last_char = ""
-        if self.__tail.count > 0:
-            last_char = self.__tail.buffer[-1]
-
-        is_empty = self.__head.count == 0 and self.__head.next is None
-        if not is_empty and last_char != "\n":
+        if self.__length > 0 and self[-1] != "\n":
             self.append("\n")
 
         self.append(arg)
 
     def insert(self, idx: int, arg: object) -> None:
-        if not arg:
+        text = str(arg)
+        if not text:
             return
 
-        current_chunk = self.__head
-        remaining_idx = idx
-        while current_chunk:
-            if remaining_idx <= current_chunk.count:
-                break
-            remaining_idx -= current_chunk.count
-            current_chunk = current_chunk.next
-        else:
-            self.append(arg)
+        idx = max(0, idx)
+        if idx >= self.__length:
+            self.append(text)
             return
 
-        tail_buffer = []
-        temp_chunk = current_chunk
-        tail_buffer.extend(temp_chunk.buffer[remaining_idx : temp_chunk.count])
-        temp_chunk = temp_chunk.next
-        while temp_chunk:
-            tail_buffer.extend(temp_chunk.buffer[: temp_chunk.count])
-            temp_chunk = temp_chunk.next
-
-        current_chunk.count = remaining_idx
-        current_chunk.next = None
-        self.__tail = current_chunk
-
-        self.append(arg)
-        for item in tail_buffer:
-            if item is not None:
-                self.append(item)
+        left, right = _split(self.__flush(), idx)
+        self.__root = _merge(_merge(left, _build(_pieces(text))), right)
+        self.__length += len(text)
+        self.__text = None
 
     def remove(self, idx: int, length: int) -> None:
-        if length <= 0:
+        if length <= 0 or idx < 0 or idx >= self.__length:
             return
 
-        current_str = str(self)
-        if idx < 0 or idx > len(current_str):
-            return
+        length = min(length, self.__length - idx)
+        left, rest = _split(self.__flush(), idx)
+        _, right = _split(rest, length)
+        self.__root = _merge(left, right)
+        self.__length -= length
+        self.__text = None
 
-        new_str = current_str[:idx] + current_str[idx + length :]
+    def substring(self, start: int, length: Optional[int] = None) -> str:
+        stop = self.__length if length is None else min(self.__length, start + length)
+        start = max(0, start)
+        if start >= stop:
+            return ""
 
-        self.clear()
-        self.append(new_str)
+        out: list[str] = []
+        _collect(self.__flush(), start, stop, out)
+        return "".join(out)
 
     def clear(self) -> None:
-        self.__head = _chunk(self.__chunk_cap)
-        self.__tail = self.__head
+        self.__root = None
+        self.__pending.clear()
+        self.__length = 0
+        self.__text = None
+
+    def __flush(self) -> Optional[_node]:
+        if self.__pending:
+            pending = _build(_pieces("".join(self.__pending)))
+            self.__root = _merge(self.__root, pending)
+            self.__pending.clear()
+        return self.__root
+
+    def __getitem__(self, key: int | slice) -> str:
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self.__length)
+            if step == 1:
+                return self.substring(start, stop - start)
+            return str(self)[key]
+
+        if key < 0:
+            key += self.__length
+        if not 0 <= key < self.__length:
+            raise IndexError("stringbuilder index out of range")
+
+        if self.__pending and key >= self.__length - len(self.__pending[-1]):
+            return self.__pending[-1][key - self.__length]
+
+        node = self.__flush()
+        while node:
+            left_length = node.left.length if node.left else 0
+            if key < left_length:
+                node = node.left
+                continue
+            key -= left_length
+            if key < len(node.text):
+                return node.text[key]
+            key -= len(node.text)
+            node = node.right
+        raise IndexError("stringbuilder index out of range")
+
+    def write_to(
+        self,
+        fp: Any,
+        encoding: Optional[str] = None,
+        errors: str = "strict",
+    ) -> int:
+        """
+        write the contents segment by segment, without building the full string.
+        `encoding` is for binary files and sockets wrapped with `makefile("wb")`.
+        returns the number of characters (or bytes, when encoding) written.
+        """
+        if encoding is None:
+            fp.writelines(self.__segments())
+            return self.__length
+
+        written = 0
+        for batch in _batches(self.__segments()):
+            data = batch.encode(encoding, errors)
+            fp.write(data)
+            written += len(data)
+        return written
+
+    def getbuffer(self, encoding: str = "utf-8", errors: str = "strict") -> memoryview:
+        """encoded contents, encoded in batches into a `bytesbuilder`"""
+        bb = bytesbuilder()
+        for batch in _batches(self.__segments()):
+            bb.append(batch.encode(encoding, errors))
+        return bb.getbuffer()
+
+    def __segments(self) -> Iterator[str]:
+        stack: list[_node] = []
+        node = self.__root
+        while stack or node:
+            while node:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.text
+            node = node.right
+        yield from self.__pending
+
+    def __len__(self) -> int:
+        return self.__length
 
     def __str__(self) -> str:
-        result = []
-        cur = self.__head
-        while cur:
-            result.extend(cur.buffer[: cur.count])
-            cur = cur.next
-        return "".join(char for char in result if char is not None)
+        if self.__text is None:
+            self.__text = "".join(self.__segments())
+            if self.__root is None:
+                # later appends only have to join onto one segment
+                self.__pending[:] = [self.__text] if self.__text else []
+        return self.__text
 
     def __repr__(self) -> str:
-        length = len(text := str(self))
-        preview = text if length <= 50 else text[:47] + "..."
+        length = self.__length
+        preview = str(self) if length <= 50 else self.substring(0, 47) + "..."
         return f"<{self.__class__.__name__} length={length} value={repr(preview)}>"
+
+
+def _collect(node: Optional[_node], start: int, stop: int, out: list[str]) -> None:
+    """append the text of `node` between `start` and `stop` to `out`"""
+    if node is None or start >= stop:
+        return
+
+    left_length = node.left.length if node.left else 0
+    if start < left_length:
+        _collect(node.left, start, min(stop, left_length), out)
+
+    text_start = left_length
+    text_stop = left_length + len(node.text)
+    if start < text_stop and stop > text_start:
+        out.append(node.text[max(0, start - text_start) : stop - text_start])
+
+    if stop > text_stop:
+        _collect(node.right, max(0, start - text_stop), stop - text_stop, out)
+
+
+def _batches(segments: Iterator[str], size: int = 1 << 16) -> Iterator[str]:
+    """join small segments into strings of about `size` characters"""
+    batch: list[str] = []
+    length = 0
+    for text in segments:
+        batch.append(text)
+        length += len(text)
+        if length >= size:
+            yield "".join(batch)
+            batch.clear()
+            length = 0
+    if batch:
+        yield "".join(batch)
+
+
+class bytesbuilder:
+    """
+    bytes counterpart of `stringbuilder`, writing into a single `bytearray`
+    whose capacity doubles when full.
+
+    `getbuffer()` exposes the written bytes as a `memoryview` without copying;
+    release it before appending past the current capacity.
+    """
+
+    def __init__(self, capacity: int = 256, encoding: str = "utf-8") -> None:
+        self.__buffer = bytearray(max(1, capacity))
+        self.__size = 0
+        self.__encoding = encoding
+
+    @property
+    def capacity(self) -> int:
+        return len(self.__buffer)
+
+    def append(self, arg: object) -> None:
+        match arg:
+            case bytes() | bytearray():
+                data = arg
+            case memoryview():
+                data = arg.cast("B") if arg.c_contiguous else arg.tobytes()
+            case str():
+                data = arg.encode(self.__encoding)
+            case _:
+                data = str(arg).encode(self.__encoding)
+
+        end = self.__size + len(data)
+        if end > len(self.__buffer):
+            self.__grow(end)
+        self.__buffer[self.__size : end] = data
+        self.__size = end
+
+    def append_format(
+        self,
+        fmt: str | format_template,
+        *args: object,
+        **kwargs: object,
+    ) -> None:
+        if type(fmt) is format_template:
+            self.append(fmt.render(*args, **kwargs))
+        else:
+            self.append(fmt.format(*args, **kwargs))  # type: ignore
+
+    def append_join(self, sep: str, *args: object) -> None:
+        self.append(sep.join(str(a) for a in args))
+
+    def append_line(self, arg: object) -> None:
+        if self.__size > 0 and self.__buffer[self.__size - 1] != 0x0A:
+            self.append(b"\n")
+
+        self.append(arg)
+
+    def write_to(self, fp: Any) -> int:
+        """write the contents with a single `fp.write`; returns the byte count"""
+        with self.getbuffer() as view:
+            fp.write(view)
+        return self.__size
+
+    def getbuffer(self) -> memoryview:
+        return memoryview(self.__buffer)[: self.__size]
+
+    def clear(self) -> None:
+        self.__size = 0
+
+    def __grow(self, required: int) -> None:
+        capacity = len(self.__buffer)
+        while capacity < required:
+            capacity *= 2
+        self.__buffer.extend(bytes(capacity - len(self.__buffer)))
+
+    def __len__(self) -> int:
+        return self.__size
+
+    def __bytes__(self) -> bytes:
+        return bytes(memoryview(self.__buffer)[: self.__size])
+
+    def __str__(self) -> str:
+        return self.__buffer[: self.__size].decode(self.__encoding)
+
+    def __repr__(self) -> str:
+        preview = self.__buffer[: min(self.__size, 50)]
+        suffix = "..." if self.__size > 50 else ""
+        return f"<{self.__class__.__name__} length={self.__size} value={bytes(preview)!r}{suffix}>"
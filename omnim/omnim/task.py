@@ -1,8 +1,40 @@
 import asyncio
-from typing import Awaitable, Callable, Optional, overload
+import math
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from array import array
+from itertools import islice
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Coroutine,
+    Iterable,
+    Optional,
+    TypeVar,
+    Union,
+    overload,
+)
+from weakref import WeakKeyDictionary, ref
+from .delegate import action, subscription
+from .rx import Computed, Observable, ReactiveProperty
+from .time import stopwatch
 
-global __interval_s
-__interval_s = 0.1
+T = TypeVar("T")
+R = TypeVar("R")
+
+_source = Union[ReactiveProperty[Any], Computed[Any], Observable[Any], action[Any]]
+_SOURCE_TYPES = (ReactiveProperty, Computed, Observable, action)
+
+_interval_s = 0.1
+
+_pool_lock = threading.Lock()
+_thread_workers: Optional[int] = None
+_process_workers: Optional[int] = None
+_thread_pool: Optional[ThreadPoolExecutor] = None
+_process_pool: Optional[ProcessPoolExecutor] = None
 
 
 @overload
@@ -18,27 +50,183 @@ def interval(value: int) -> None:
 
 
 def interval(value: float | int) -> None:
-    global __interval_s
+    """default polling interval; prefer `interval_s=` on the call itself"""
+    global _interval_s
+    _interval_s = _seconds(value)
+
+
+def _seconds(value: float | int) -> float:
     match value:
         case float() as s:
-            __interval_s = max(0.001, s)
+            return max(0.001, s)
         case int() as ms:
-            __interval_s = max(0.001, ms / 1000.0)
+            return max(0.001, ms / 1000.0)
+    raise TypeError(f"expected float seconds or int milliseconds, not {value!r}")
+
+
+class timer_wheel:
+    """
+    hierarchical timer wheel for one event loop. every pending `sleep` lands
+    in a slot of `slots` ticks; coarser levels cascade into finer ones as
+    their time comes. the wheel runs one loop callback per non-empty tick
+    (at most one per `slots` ticks while only long timers are pending),
+    however many sleepers there are. delays are rounded up to whole ticks.
+    """
+
+    def __init__(
+        self,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+        tick_s: float = 0.001,
+        bits: int = 6,
+        levels: int = 4,
+    ) -> None:
+        loop = loop or asyncio.get_running_loop()
+        # weak, so the shared wheel registry does not keep closed loops alive
+        self.__loop_ref = ref(loop)
+        self.__tick_s = tick_s
+        self.__bits = bits
+        self.__mask = (1 << bits) - 1
+        self.__levels: list[list[list[tuple[int, asyncio.Future[None]]]]] = [
+            [[] for _ in range(1 << bits)] for _ in range(levels)
+        ]
+        self.__origin = loop.time()
+        self.__now = 0
+        self.__pending = 0
+        self.__handle: Optional[asyncio.TimerHandle] = None
+        self.__next = 0
+        self.callbacks = 0
+
+    @property
+    def __loop(self) -> asyncio.AbstractEventLoop:
+        loop = self.__loop_ref()
+        if loop is None:
+            raise RuntimeError("the event loop of this timer wheel is gone")
+        return loop
+
+    @property
+    def tick_s(self) -> float:
+        return self.__tick_s
+
+    def __len__(self) -> int:
+        return self.__pending
+
+    def sleep(self, seconds: float) -> "asyncio.Future[None]":
+        """future resolved on the first tick at least `seconds` from now"""
+        fut = self.__loop.create_future()
+        if self.__handle is None:
+            self.__now = self.__current()
+        elapsed = self.__loop.time() - self.__origin
+        due = max(self.__now + 1, math.ceil((elapsed + seconds) / self.__tick_s))
+        self.__insert(due, fut)
+        self.__pending += 1
+        if self.__handle is not None and due < self.__next:
+            self.__handle.cancel()
+            self.__handle = None
+        self.__schedule()
+        return fut
+
+    def __current(self) -> int:
+        return int((self.__loop.time() - self.__origin) / self.__tick_s)
+
+    def __insert(self, due: int, fut: "asyncio.Future[None]") -> None:
+        delta = max(1, due - self.__now)
+        level = 0
+        while level < len(self.__levels) - 1 and delta >> (self.__bits * (level + 1)):
+            level += 1
+        slot = (due >> (self.__bits * level)) & self.__mask
+        self.__levels[level][slot].append((due, fut))
+
+    def __schedule(self) -> None:
+        if self.__handle is not None or not self.__pending:
+            return
+        target = (self.__now | self.__mask) + 1
+        base = self.__levels[0]
+        for t in range(self.__now + 1, target):
+            if base[t & self.__mask]:
+                target = t
+                break
+        self.__next = target
+        self.__handle = self.__loop.call_at(
+            self.__origin + target * self.__tick_s, self.__tick
+        )
+
+    def __tick(self) -> None:
+        self.__handle = None
+        self.callbacks += 1
+        target = self.__current()
+        while self.__now < target and self.__pending:
+            self.__step()
+        self.__now = max(self.__now, target)
+        self.__schedule()
+
+    def __step(self) -> None:
+        self.__now = now = self.__now + 1
+        for level in range(len(self.__levels) - 1, 0, -1):
+            if now & ((1 << (self.__bits * level)) - 1) == 0:
+                slot = (now >> (self.__bits * level)) & self.__mask
+                entries, self.__levels[level][slot] = self.__levels[level][slot], []
+                for due, fut in entries:
+                    self.__insert(due, fut)
+        base = self.__levels[0]
+        entries, base[now & self.__mask] = base[now & self.__mask], []
+        for due, fut in entries:
+            if due > now:
+                base[now & self.__mask].append((due, fut))
+                continue
+            self.__pending -= 1
+            if not fut.done():
+                fut.set_result(None)
+
+
+_wheels: "WeakKeyDictionary[asyncio.AbstractEventLoop, timer_wheel]" = (
+    WeakKeyDictionary()
+)
+
+
+def wheel() -> timer_wheel:
+    """the shared timer wheel of the running loop, used by polling and `delay`"""
+    loop = asyncio.get_running_loop()
+    if (w := _wheels.get(loop)) is None:
+        # a wheel still holding futures of a closed loop keeps that loop alive
+        for closed in [old for old in _wheels.keys() if old.is_closed()]:
+            del _wheels[closed]
+        w = _wheels[loop] = timer_wheel(loop)
+    return w
 
 
 async def wait_until(
     predicate: Callable[[], bool],
     timeout: Optional[float] = None,
+    *,
+    on: Union[_source, Iterable[_source], None] = None,
+    backoff: bool = False,
+    interval_s: Optional[float | int] = None,
 ) -> bool:
+    """
+    with `on`, re-check `predicate` only when one of those sources changes
+    (ReactiveProperty, Computed, Observable or action); it is checked from the
+    thread that made the change, so a brief true state is not missed.
+    otherwise poll every `interval_s` (default: `interval()`) on the shared
+    timer wheel, or with `backoff` start at 1 ms and double up to it, which
+    suits predicates that usually hold quickly.
+    """
+    if on is not None:
+        return await _wait_event(predicate, timeout, on)
+
     loop = asyncio.get_running_loop()
     start = loop.time()
+    timer = wheel()
+    period = _interval_s if interval_s is None else _seconds(interval_s)
+    wait_s = 0.001 if backoff else period
 
     while not predicate():
         if timeout is not None:
             if (loop.time() - start) > timeout:
                 raise TimeoutError()
 
-        await asyncio.sleep(__interval_s)
+        await timer.sleep(wait_s)
+        if backoff:
+            wait_s = min(wait_s * 2, period)
 
     return True
 
@@ -46,22 +234,165 @@ async def wait_until(
 async def wait_while(
     predicate: Callable[[], bool],
     timeout: Optional[float] = None,
+    *,
+    on: Union[_source, Iterable[_source], None] = None,
+    backoff: bool = False,
+    interval_s: Optional[float | int] = None,
+) -> bool:
+    return await wait_until(
+        lambda: not predicate(),
+        timeout,
+        on=on,
+        backoff=backoff,
+        interval_s=interval_s,
+    )
+
+
+async def _wait_event(
+    predicate: Callable[[], bool],
+    timeout: Optional[float],
+    on: Union[_source, Iterable[_source]],
 ) -> bool:
-    return await wait_until(lambda: not predicate(), timeout)
+    if predicate():
+        return True
+
+    loop = asyncio.get_running_loop()
+    done = loop.create_future()
+
+    def resolve() -> None:
+        if not done.done():
+            done.set_result(True)
+
+    def on_change(*_: Any) -> None:
+        if not done.done() and predicate():
+            loop.call_soon_threadsafe(resolve)
+
+    sources = [on] if isinstance(on, _SOURCE_TYPES) else list(on)
+    handles = [_listen(src, on_change) for src in sources]
+    try:
+        if predicate():
+            return True
+        return await asyncio.wait_for(done, timeout)
+    finally:
+        for handle in handles:
+            handle.dispose()
+
+
+def _listen(src: _source, cb: Callable[..., None]) -> subscription:
+    match src:
+        case ReactiveProperty():
+            return src.on_changed.register(cb)
+        case Computed() | Observable():
+            return src.subscribe(cb)
+        case action():
+            return src.register(cb)
+    raise TypeError(f"cannot wait on {type(src).__name__}")
 
 
 async def wait_all(*tasks: Awaitable):
     return await asyncio.gather(*tasks)
 
 
-async def wait_any(*tasks: Awaitable):
+async def wait_any(*tasks: Awaitable, cancel_rest: bool = False):
+    """with `cancel_rest`, the unfinished tasks are cancelled and awaited"""
     done, pending = await asyncio.wait(
         [asyncio.ensure_future(t) for t in tasks],
         return_when=asyncio.FIRST_COMPLETED,
     )
+    if cancel_rest and pending:
+        for t in pending:
+            t.cancel()
+        await asyncio.wait(pending)
     return done, pending
 
 
+async def as_completed(
+    *tasks: Awaitable[T], timeout: Optional[float] = None
+) -> AsyncIterator[T]:
+    """
+    yield results in completion order. closing the generator early (error,
+    timeout, or `break` inside `contextlib.aclosing`) cancels the tasks that
+    have not finished.
+    """
+    futures = [asyncio.ensure_future(t) for t in tasks]
+    try:
+        for next_done in asyncio.as_completed(futures, timeout=timeout):
+            yield await next_done
+    finally:
+        pending = [f for f in futures if not f.done()]
+        for f in pending:
+            f.cancel()
+        if pending:
+            await asyncio.wait(pending)
+
+
+class scope:
+    """
+    structured task scope over `asyncio.TaskGroup`: leaving the block awaits
+    every spawned task, and the first failure cancels the siblings and is
+    raised in an ExceptionGroup. `limit` bounds how many spawned tasks run
+    at once; the rest wait for a slot.
+    """
+
+    def __init__(self, limit: Optional[int] = None) -> None:
+        if limit is not None and limit < 1:
+            raise ValueError("limit must be positive")
+        self.__group = asyncio.TaskGroup()
+        self.__slots = None if limit is None else asyncio.Semaphore(limit)
+
+    async def __aenter__(self) -> "scope":
+        await self.__group.__aenter__()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> Optional[bool]:
+        return await self.__group.__aexit__(exc_type, exc_val, exc_tb)
+
+    def spawn(self, coro: Coroutine[Any, Any, T]) -> "asyncio.Task[T]":
+        if self.__slots is None:
+            return self.__group.create_task(coro)
+        task = self.__group.create_task(self.__bounded(coro))
+        # cancelled before its first step, the wrapper never runs its body
+        task.add_done_callback(lambda _: coro.close())
+        return task
+
+    async def __bounded(self, coro: Coroutine[Any, Any, T]) -> T:
+        try:
+            async with self.__slots:
+                return await coro
+        finally:
+            # no-op once awaited; a coroutine still queued for a slot is closed
+            coro.close()
+
+
+async def map_concurrent(
+    fn: Callable[[T], Awaitable[R]],
+    items: Iterable[T],
+    limit: int = 8,
+) -> list[R]:
+    """
+    `[await fn(x) for x in items]` with at most `limit` calls in flight.
+    `limit` workers pull from `items`, so a long or lazy iterable is not
+    turned into tasks up front. the first failure cancels the remaining
+    calls and is re-raised.
+    """
+    if limit < 1:
+        raise ValueError("limit must be positive")
+    source = enumerate(items)
+    results: dict[int, R] = {}
+
+    async def worker() -> None:
+        for i, item in source:
+            results[i] = await fn(item)
+
+    try:
+        async with scope() as workers:
+            for _ in range(limit):
+                workers.spawn(worker())
+    except ExceptionGroup as eg:
+        raise eg.exceptions[0] from None
+    return [results[i] for i in range(len(results))]
+
+
 async def with_timeout(task: Awaitable, timeout: float):
     return await asyncio.wait_for(task, timeout)
 
@@ -71,4 +402,234 @@ async def wait_frame():
 
 
 async def delay(seconds: float):
-    await asyncio.sleep(seconds)
+    if seconds <= 0:
+        await asyncio.sleep(0)
+        return
+    await wheel().sleep(seconds)
+
+
+class frame_stats:
+    """frame times (seconds between frame starts) of the last `history` frames"""
+
+    __slots__ = ("frames", "overruns", "dropped_steps", "__times", "__history")
+
+    def __init__(self, history: int = 1024) -> None:
+        self.frames = 0
+        self.overruns = 0
+        self.dropped_steps = 0
+        self.__times = array("d", bytes(8 * history))
+        self.__history = history
+
+    def add(self, frame_s: float) -> None:
+        self.__times[self.frames % self.__history] = frame_s
+        self.frames += 1
+
+    def percentile(self, p: float) -> float:
+        n = min(self.frames, self.__history)
+        if not n:
+            return 0.0
+        ordered = sorted(self.__times[:n])
+        return ordered[min(n - 1, int(p / 100 * n))]
+
+    @property
+    def p50(self) -> float:
+        return self.percentile(50)
+
+    @property
+    def p99(self) -> float:
+        return self.percentile(99)
+
+    @property
+    def mean(self) -> float:
+        n = min(self.frames, self.__history)
+        return sum(self.__times[:n]) / n if n else 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__} frames={self.frames} "
+            f"p50={self.p50 * 1000:.3f}ms p99={self.p99 * 1000:.3f}ms "
+            f"overruns={self.overruns} dropped_steps={self.dropped_steps}>"
+        )
+
+
+class frame_loop:
+    """
+    fixed-timestep game loop. each frame runs `on_update(step_s)` once per
+    whole step of elapsed `stopwatch` time, at most `max_steps` times (the
+    rest of the backlog is dropped rather than spiralling), then
+    `on_render(alpha)` with the leftover fraction of a step for
+    interpolation. frames are paced to `rate` by sleeping on the loop until
+    `spin_s` before the deadline and yielding with `wait_frame` after that.
+    """
+
+    def __init__(
+        self,
+        rate: float = 60.0,
+        *,
+        step_s: Optional[float] = None,
+        max_steps: int = 5,
+        spin_s: float = 0.002,
+        history: int = 1024,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if max_steps < 1:
+            raise ValueError("max_steps must be positive")
+        self.__period = 1.0 / rate
+        self.__step = self.__period if step_s is None else step_s
+        self.__max_steps = max_steps
+        self.__spin = spin_s
+        self.__running = False
+        self.__history = history
+        self.stats = frame_stats(history)
+        self.on_update = action[float]()
+        self.on_render = action[float]()
+
+    @property
+    def period_s(self) -> float:
+        return self.__period
+
+    @property
+    def is_running(self) -> bool:
+        return self.__running
+
+    def stop(self) -> None:
+        """finish the current frame and return from `run`"""
+        self.__running = False
+
+    async def run(self, frames: Optional[int] = None) -> frame_stats:
+        """run `frames` frames (or until `stop`); `stats` covers this run only"""
+        clock = stopwatch(auto_start=True)
+        self.__running = True
+        self.stats = stats = frame_stats(self.__history)
+        period, step = self.__period, self.__step
+        accumulated = 0.0
+        count = 0
+        last = deadline = clock.elapsed_s
+        try:
+            while self.__running and (frames is None or count < frames):
+                now = clock.elapsed_s
+                if count:
+                    stats.add(now - last)
+                accumulated += now - last
+                last = now
+                count += 1
+
+                steps = 0
+                while accumulated >= step and steps < self.__max_steps:
+                    self.on_update.invoke(step)
+                    accumulated -= step
+                    steps += 1
+                if accumulated >= step:
+                    dropped = int(accumulated / step)
+                    stats.dropped_steps += dropped
+                    accumulated -= dropped * step
+                self.on_render.invoke(accumulated / step)
+
+                deadline += period
+                if clock.elapsed_s > deadline:
+                    stats.overruns += 1
+                    deadline = clock.elapsed_s
+                    await wait_frame()
+                    continue
+                await self.__sleep_until(clock, deadline)
+            if count:
+                stats.add(clock.elapsed_s - last)
+        finally:
+            self.__running = False
+            clock.stop()
+        return stats
+
+    async def __sleep_until(self, clock: stopwatch, deadline: float) -> None:
+        remaining = deadline - clock.elapsed_s
+        if remaining > self.__spin:
+            await asyncio.sleep(remaining - self.__spin)
+        while clock.elapsed_s < deadline:
+            await wait_frame()
+
+
+def workers(threads: Optional[int] = None, processes: Optional[int] = None) -> None:
+    """
+    size of the pools behind `run_in_thread` / `run_in_process` (None keeps
+    the current setting). a running pool is shut down once its queued work
+    finishes and recreated at the new size on next use.
+    """
+    global _thread_workers, _process_workers, _thread_pool, _process_pool
+    with _pool_lock:
+        if threads is not None:
+            _thread_workers = threads
+            if _thread_pool is not None:
+                _thread_pool.shutdown(wait=False)
+                _thread_pool = None
+        if processes is not None:
+            _process_workers = processes
+            if _process_pool is not None:
+                _process_pool.shutdown(wait=False)
+                _process_pool = None
+
+
+def thread_pool() -> ThreadPoolExecutor:
+    global _thread_pool
+    with _pool_lock:
+        if _thread_pool is None:
+            _thread_pool = ThreadPoolExecutor(
+                _thread_workers, thread_name_prefix="omnim"
+            )
+        return _thread_pool
+
+
+def process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+    with _pool_lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(_process_workers)
+        return _process_pool
+
+
+def shutdown(wait: bool = True) -> None:
+    global _thread_pool, _process_pool
+    with _pool_lock:
+        pools, _thread_pool, _process_pool = (_thread_pool, _process_pool), None, None
+    for pool in pools:
+        if pool is not None:
+            pool.shutdown(wait=wait)
+
+
+async def run_in_thread(fn: Callable[..., R], *args: Any, **kwargs: Any) -> R:
+    """run blocking `fn` on the shared thread pool without blocking the loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(thread_pool(), partial(fn, *args, **kwargs))
+
+
+async def run_in_process(fn: Callable[..., R], *args: Any, **kwargs: Any) -> R:
+    """run CPU-bound `fn` on the shared process pool; fn and args must pickle"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(process_pool(), partial(fn, *args, **kwargs))
+
+
+def _apply(fn: Callable[[T], R], batch: list[T]) -> list[R]:
+    return [fn(item) for item in batch]
+
+
+async def run_batched(
+    fn: Callable[[T], R],
+    items: Iterable[T],
+    batch_size: int = 256,
+    *,
+    executor: Optional[Executor] = None,
+) -> list[R]:
+    """
+    `[fn(x) for x in items]` on a pool (the shared process pool by default),
+    submitting `batch_size` items per task so many small calls pay the
+    pickling and scheduling cost once per batch.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be positive")
+    loop = asyncio.get_running_loop()
+    pool = process_pool() if executor is None else executor
+    it = iter(items)
+    batches = [
+        loop.run_in_executor(pool, _apply, fn, batch)
+        for batch in iter(lambda: list(islice(it, batch_size)), [])
+    ]
+    return [r for batch in await asyncio.gather(*batches) for r in batch]
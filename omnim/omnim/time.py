@@ -1,8 +1,16 @@
 from datetime import datetime, timedelta
 import functools
+import gc
 import inspect
-from time import perf_counter
-from typing import Callable, Iterator, Optional
+import json
+import math
+import statistics
+import threading
+import weakref
+from array import array
+from contextvars import ContextVar
+from time import perf_counter, perf_counter_ns
+from typing import IO, Any, Callable, Iterator, Optional
 from .delegate import action
 
 _ON_CONTROL = Optional[Callable[[], None]]
@@ -10,6 +18,22 @@ _ON_LAP = Optional[Callable[[timedelta], None]]
 
 
 class stopwatch:
+    """
+    the on_start/on_stop/on_lap actions are created on first access, so a
+    stopwatch nobody subscribes to carries no delegates.
+    """
+
+    __slots__ = (
+        "__is_running",
+        "__start",
+        "__stop",
+        "__laps",
+        "__last_lap",
+        "__on_start",
+        "__on_stop",
+        "__on_lap",
+    )
+
     def __init__(
         self,
         *,
@@ -23,12 +47,12 @@ class stopwatch:
         self.__start = self.__now_s
         self.__stop = self.__now_s
 
-        self.__laps: list[timedelta] = []
+        self.__laps: list[float] = []
         self.__last_lap = self.__now_s
 
-        self.__on_start: action[()] = action(on_start) if on_start else action()
-        self.__on_stop: action[()] = action(on_stop) if on_stop else action()
-        self.__on_lap: action[timedelta] = action(on_lap) if on_lap else action()
+        self.__on_start: Optional[action[()]] = action(on_start) if on_start else None
+        self.__on_stop: Optional[action[()]] = action(on_stop) if on_stop else None
+        self.__on_lap: Optional[action[timedelta]] = action(on_lap) if on_lap else None
 
         if auto_start:
             self.start()
@@ -39,14 +63,20 @@ class stopwatch:
 
     @property
     def on_start(self) -> action[()]:
+        if self.__on_start is None:
+            self.__on_start = action()
         return self.__on_start
 
     @property
     def on_stop(self) -> action[()]:
+        if self.__on_stop is None:
+            self.__on_stop = action()
         return self.__on_stop
 
     @property
     def on_lap(self) -> action[timedelta]:
+        if self.__on_lap is None:
+            self.__on_lap = action()
         return self.__on_lap
 
     @property
@@ -55,14 +85,22 @@ class stopwatch:
 
     @property
     def elapsed(self) -> timedelta:
+        return timedelta(seconds=self.elapsed_s)
+
+    @property
+    def elapsed_s(self) -> float:
         if self.__is_running:
-            return timedelta(seconds=self.__now_s - self.__start)
-        return timedelta(seconds=self.__stop - self.__start)
+            return self.__now_s - self.__start
+        return self.__stop - self.__start
 
     @property
     def laps(self) -> Iterator[timedelta]:
         for lap in self.__laps:
-            yield lap
+            yield timedelta(seconds=lap)
+
+    @property
+    def laps_s(self) -> list[float]:
+        return list(self.__laps)
 
     def start(self) -> None:
         if not self.__is_running:
@@ -71,7 +109,8 @@ class stopwatch:
             self.__last_lap = now
             self.__is_running = True
 
-            self.__on_start.invoke()
+            if self.__on_start:
+                self.__on_start.invoke()
 
     def restart(self) -> None:
         self.stop()
@@ -82,18 +121,20 @@ class stopwatch:
             self.__stop = self.__now_s
             self.__is_running = False
 
-            self.__on_stop.invoke()
+            if self.__on_stop:
+                self.__on_stop.invoke()
 
     def lap(self) -> None:
         if not self.__is_running:
             return
 
         now = self.__now_s
-        lap_time = timedelta(now - self.__last_lap)
+        lap_s = now - self.__last_lap
         self.__last_lap = now
-        self.__laps.append(lap_time)
+        self.__laps.append(lap_s)
 
-        self.__on_lap.invoke(lap_time)
+        if self.__on_lap:
+            self.__on_lap.invoke(timedelta(seconds=lap_s))
 
     def __enter__(self) -> "stopwatch":
         self.start()
@@ -109,7 +150,6 @@ class stopwatch:
         return f"<{self.__class__.__name__} is_running={self.__is_running} elapsed={self.__str__()}>"
 
 
-@staticmethod
 def benchmark(func):
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
@@ -133,3 +173,398 @@ def benchmark(func):
             return result
 
     return wrapper
+
+
+class bench_result:
+    """per-call seconds of each timed run of `name` (`number` calls per run)"""
+
+    __slots__ = ("name", "number", "samples")
+
+    def __init__(self, name: str, number: int, samples: list[float]) -> None:
+        self.name = name
+        self.number = number
+        self.samples = samples
+
+    @property
+    def mean(self) -> float:
+        return statistics.fmean(self.samples)
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.samples)
+
+    @property
+    def stddev(self) -> float:
+        return statistics.stdev(self.samples) if len(self.samples) > 1 else 0.0
+
+    @property
+    def min(self) -> float:
+        return min(self.samples)
+
+    @property
+    def p99(self) -> float:
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, math.ceil(0.99 * len(ordered)) - 1)]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "number": self.number,
+            "mean": self.mean,
+            "median": self.median,
+            "stddev": self.stddev,
+            "min": self.min,
+            "p99": self.p99,
+            "samples": self.samples,
+        }
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__} {self.name} "
+            f"median={_format_s(self.median)} stddev={_format_s(self.stddev)}>"
+        )
+
+
+def measure(
+    func: Callable[..., Any],
+    *args: Any,
+    name: Optional[str] = None,
+    repeat: int = 7,
+    warmup: int = 1,
+    number: Optional[int] = None,
+    target_s: float = 0.05,
+    disable_gc: bool = True,
+    **kwargs: Any,
+) -> bench_result:
+    """
+    time `func(*args, **kwargs)`: `warmup` untimed runs, then `repeat` runs
+    of `number` calls each. without `number`, it is calibrated (1, 2, 5,
+    10, ...) until one run takes at least `target_s`. the collector is
+    paused while timing unless `disable_gc` is False.
+    """
+    call = functools.partial(func, *args, **kwargs) if args or kwargs else func
+
+    def run(n: int) -> float:
+        start = perf_counter()
+        for _ in range(n):
+            call()
+        return perf_counter() - start
+
+    gc_was_enabled = gc.isenabled()
+    if disable_gc:
+        gc.collect()
+        gc.disable()
+    try:
+        if number is None:
+            number = _calibrate(run, target_s)
+        for _ in range(warmup):
+            run(number)
+        samples = [run(number) / number for _ in range(repeat)]
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return bench_result(name or func.__name__, number, samples)
+
+
+def _calibrate(run: Callable[[int], float], target_s: float) -> int:
+    scale = 1
+    while True:
+        for n in (scale, 2 * scale, 5 * scale):
+            if run(n) >= target_s:
+                return n
+        scale *= 10
+
+
+def _format_s(seconds: float) -> str:
+    for unit, factor in (("s", 1.0), ("ms", 1e3), ("us", 1e6)):
+        if seconds * factor >= 1:
+            return f"{seconds * factor:.3f} {unit}"
+    return f"{seconds * 1e9:.1f} ns"
+
+
+def table(results: list[bench_result], baseline: Optional[str] = None) -> str:
+    """
+    comparison table; `relative` is each median against the `baseline`
+    result (default: the fastest). an unknown `baseline` raises ValueError.
+    """
+    if not results:
+        return ""
+    base = min(results, key=lambda r: r.median)
+    if baseline is not None:
+        base = next((r for r in results if r.name == baseline), None)
+        if base is None:
+            raise ValueError(f"no result named {baseline!r}")
+    header = ("name", "median", "mean", "stddev", "p99", "relative")
+    rows = [
+        (
+            r.name,
+            _format_s(r.median),
+            _format_s(r.mean),
+            _format_s(r.stddev),
+            _format_s(r.p99),
+            f"{r.median / base.median:.2f}x",
+        )
+        for r in results
+    ]
+    widths = [max(len(row[i]) for row in (header, *rows)) for i in range(len(header))]
+    lines = [
+        "  ".join(
+            cell.ljust(w) if i == 0 else cell.rjust(w)
+            for i, (cell, w) in enumerate(zip(row, widths))
+        )
+        for row in (header, *rows)
+    ]
+    lines.insert(1, "  ".join("-" * w for w in widths))
+    return "\n".join(lines)
+
+
+def to_json(results: list[bench_result], fp: Optional[IO[str]] = None) -> str:
+    """serialize results (written to `fp` as well, if given)"""
+    text = json.dumps(
+        {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "results": [r.to_dict() for r in results],
+        },
+        indent=2,
+    )
+    if fp is not None:
+        fp.write(text)
+    return text
+
+
+class suite:
+    """named implementations measured with the same arguments and settings"""
+
+    def __init__(self, **options: Any) -> None:
+        self.__cases: list[tuple[str, Callable[..., Any]]] = []
+        self.__options = options
+        self.results: list[bench_result] = []
+
+    def add(
+        self, func: Callable[..., Any], name: Optional[str] = None
+    ) -> Callable[..., Any]:
+        """register `func`; usable as a decorator"""
+        self.__cases.append((name or func.__name__, func))
+        return func
+
+    def run(self, *args: Any, **kwargs: Any) -> list[bench_result]:
+        self.results = [
+            measure(func, *args, name=name, **self.__options, **kwargs)
+            for name, func in self.__cases
+        ]
+        return self.results
+
+    def table(self, baseline: Optional[str] = None) -> str:
+        return table(self.results, baseline)
+
+    def to_json(self, fp: Optional[IO[str]] = None) -> str:
+        return to_json(self.results, fp)
+
+
+_spans_enabled = False
+_span_capacity = 1 << 16
+_span_lock = threading.Lock()
+_span_paths: dict[tuple[int, str], int] = {}
+_span_names: list[str] = []
+_span_rings: list["_span_ring"] = []
+_span_retired: Optional["_span_ring"] = None
+_span_local = threading.local()
+_span_parent: ContextVar[int] = ContextVar("_span_parent", default=-1)
+
+
+class _span_ring:
+    """the last `capacity` (path id, duration ns) records of one thread"""
+
+    __slots__ = ("ids", "durations", "written")
+
+    def __init__(self, capacity: int) -> None:
+        self.ids = array("l", [0]) * capacity
+        self.durations = array("q", [0]) * capacity
+        self.written = 0
+
+    def push(self, path: int, duration: int) -> None:
+        i = self.written % len(self.ids)
+        self.ids[i] = path
+        self.durations[i] = duration
+        self.written += 1
+
+    def records(self) -> Iterator[tuple[int, int]]:
+        n = min(self.written, len(self.ids))
+        return zip(self.ids[:n], self.durations[:n])
+
+
+class _span_owner:
+    """lives in the thread-local, so it is collected when its thread ends"""
+
+    __slots__ = ("__weakref__",)
+
+
+def _retire(ring: _span_ring) -> None:
+    # a dead thread's records move into one shared ring, so only live threads
+    # keep a ring of their own
+    global _span_retired
+    with _span_lock:
+        _span_rings.remove(ring)
+        if ring.written == 0:
+            return
+        if _span_retired is None:
+            _span_retired = _span_ring(len(ring.ids))
+        for path, duration in ring.records():
+            _span_retired.push(path, duration)
+
+
+def _ring() -> _span_ring:
+    try:
+        return _span_local.ring
+    except AttributeError:
+        ring = _span_local.ring = _span_ring(_span_capacity)
+        owner = _span_local.owner = _span_owner()
+        with _span_lock:
+            _span_rings.append(ring)
+        weakref.finalize(owner, _retire, ring).atexit = False
+        return ring
+
+
+def _path_id(parent: int, name: str) -> int:
+    key = (parent, name)
+    if (path := _span_paths.get(key)) is None:
+        with _span_lock:
+            if (path := _span_paths.get(key)) is None:
+                prefix = "" if parent < 0 else _span_names[parent] + "/"
+                path = _span_paths[key] = len(_span_names)
+                _span_names.append(prefix + name)
+    return path
+
+
+class _span:
+    __slots__ = ("name", "path", "token", "start")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __enter__(self) -> "_span":
+        self.path = _path_id(_span_parent.get(), self.name)
+        self.token = _span_parent.set(self.path)
+        self.start = perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        duration = perf_counter_ns() - self.start
+        _span_parent.reset(self.token)
+        _ring().push(self.path, duration)
+
+
+class _null_span:
+    __slots__ = ()
+
+    def __enter__(self) -> "_null_span":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        pass
+
+
+_NULL_SPAN = _null_span()
+
+
+def span(name: str) -> Any:
+    """
+    `with span("linq.join"):` records the block's duration under its path
+    ("outer/linq.join" when nested in another span, including across awaits
+    of the same task) into a preallocated ring buffer of the current thread.
+    while spans are disabled (the default) it returns a shared no-op context
+    manager.
+    """
+    if not _spans_enabled:
+        return _NULL_SPAN
+    return _span(name)
+
+
+def enable_spans(capacity: Optional[int] = None) -> None:
+    """
+    start recording; `capacity` sizes rings created from now on. every thread
+    that records a span holds a ring of 16 bytes per record (1 MiB at the
+    default 65536) until it ends; the rings of ended threads are merged into
+    one shared ring of the same size.
+    """
+    global _spans_enabled, _span_capacity
+    if capacity is not None:
+        _span_capacity = capacity
+    _spans_enabled = True
+
+
+def disable_spans() -> None:
+    global _spans_enabled
+    _spans_enabled = False
+
+
+def reset_spans() -> None:
+    global _span_retired
+    with _span_lock:
+        for ring in _span_rings:
+            ring.written = 0
+        _span_retired = None
+
+
+class span_stats:
+    """
+    durations of one span path, from the records still held in the rings.
+    `buckets[i]` counts durations in [2**i, 2**(i+1)) ns.
+    """
+
+    __slots__ = ("path", "durations", "buckets")
+
+    def __init__(self, path: str, durations: list[int]) -> None:
+        self.path = path
+        self.durations = sorted(durations)
+        self.buckets = [0] * 64
+        for d in self.durations:
+            self.buckets[max(0, d.bit_length() - 1)] += 1
+
+    @property
+    def count(self) -> int:
+        return len(self.durations)
+
+    @property
+    def total_ns(self) -> int:
+        return sum(self.durations)
+
+    @property
+    def mean_ns(self) -> float:
+        return self.total_ns / self.count
+
+    def percentile_ns(self, p: float) -> int:
+        n = self.count
+        return self.durations[min(n - 1, max(0, math.ceil(p / 100 * n) - 1))]
+
+    @property
+    def p50_ns(self) -> int:
+        return self.percentile_ns(50)
+
+    @property
+    def p99_ns(self) -> int:
+        return self.percentile_ns(99)
+
+    @property
+    def max_ns(self) -> int:
+        return self.durations[-1]
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__} {self.path} count={self.count} "
+            f"p50={_format_s(self.p50_ns / 1e9)} p99={_format_s(self.p99_ns / 1e9)}>"
+        )
+
+
+def spans() -> dict[str, span_stats]:
+    """aggregate every thread's recorded spans by path"""
+    with _span_lock:
+        rings = list(_span_rings)
+        if _span_retired is not None:
+            rings.append(_span_retired)
+        names = list(_span_names)
+    durations: dict[int, list[int]] = {}
+    for ring in rings:
+        for path, duration in ring.records():
+            durations.setdefault(path, []).append(duration)
+    return {names[path]: span_stats(names[path], d) for path, d in durations.items()}
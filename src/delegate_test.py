@@ -0,0 +1,222 @@
+import asyncio
+import gc
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from omnim.delegate import action, func, pruned_count, result_policy
+from omnim.rx import ReactiveProperty
+
+
+class action_test(unittest.TestCase):
+
+    def test_invoke(self):
+        received = []
+        on_value = action[int](received.append)
+        on_value += lambda v: received.append(v * 10)
+
+        on_value(1)
+        on_value.invoke(2)
+
+        self.assertEqual(received, [1, 10, 2, 20])
+        self.assertEqual(len(on_value), 2)
+
+    def test_unregister_during_invoke(self):
+        calls = []
+        on_event = action[()]()
+
+        def once():
+            calls.append("once")
+            on_event.unregister(once)
+
+        on_event += once
+        on_event += lambda: calls.append("always")
+
+        on_event()
+        on_event()
+
+        self.assertEqual(calls, ["once", "always", "always"])
+        self.assertEqual(len(on_event), 1)
+
+    def test_subscription_handle(self):
+        calls = []
+        on_event = action[int]()
+        handles = [on_event.register(calls.append) for _ in range(1000)]
+
+        handles[500].dispose()
+        handles[500].dispose()
+        on_event(7)
+
+        self.assertEqual(len(calls), 999)
+        self.assertFalse(handles[500].active)
+        with on_event.register(lambda v: calls.append(-v)):
+            on_event(1)
+        on_event(2)
+        self.assertEqual(calls.count(-1), 1)
+        self.assertNotIn(-2, calls)
+
+    def test_unregister_missing(self):
+        with self.assertRaises(ValueError):
+            action[()]().unregister(print)
+
+
+class func_test(unittest.TestCase):
+
+    def test_invoke(self):
+        on_authorised = func[bool](lambda: True)
+
+        self.assertTrue(on_authorised())
+        on_authorised.clear()
+        with self.assertRaises(ValueError):
+            on_authorised.invoke()
+
+    def test_first_runs_one_callback(self):
+        calls = []
+        on_query = func[int, int](
+            lambda x: calls.append("a") or x,
+            lambda x: calls.append("b") or -x,
+        )
+
+        self.assertEqual(on_query(3), 3)
+        self.assertEqual(calls, ["a"])
+
+    def test_policies(self):
+        handlers = [lambda x: None, lambda x: x * 2, lambda x: x * 3]
+
+        last = func[int, int](*handlers[1:], policy=result_policy.last)
+        total = func[int, int](
+            *handlers[1:], policy=result_policy.reduce, combiner=lambda a, b: a + b
+        )
+        found = func[int, int](*handlers, policy=result_policy.first_not_none)
+
+        self.assertEqual(last(5), 15)
+        self.assertEqual(total(5), 25)
+        self.assertEqual(found(5), 10)
+        with self.assertRaises(ValueError):
+            func[int, int](policy=result_policy.reduce)
+
+    def test_invoke_all_is_lazy(self):
+        calls = []
+        on_query = func[int](lambda: calls.append(1) or 1, lambda: calls.append(2) or 2)
+
+        results = on_query.invoke_all()
+        self.assertEqual(calls, [])
+        self.assertEqual(next(results), 1)
+        self.assertEqual(calls, [1])
+        self.assertEqual(list(results), [2])
+
+
+class weak_test(unittest.TestCase):
+
+    class listener:
+        def __init__(self):
+            self.received = []
+
+        def on(self, v):
+            self.received.append(v)
+
+    def test_bound_method_pruned(self):
+        on_value = action[int]()
+        alive, dead = self.listener(), self.listener()
+        on_value.register_weak(alive.on, dead.on)
+        on_value(1)
+
+        before = pruned_count()
+        del dead
+        gc.collect()
+        on_value(2)
+
+        self.assertEqual(alive.received, [1, 2])
+        self.assertEqual(len(on_value), 1)
+        self.assertEqual(on_value.pruned, 1)
+        self.assertEqual(pruned_count(), before + 1)
+
+    def test_unregister_weak(self):
+        on_value = action[int]()
+        target = self.listener()
+        on_value.register_weak(target.on)
+        on_value.unregister(target.on)
+        on_value(1)
+
+        self.assertEqual(target.received, [])
+        self.assertEqual(len(on_value), 0)
+
+    def test_reactive_property_weak(self):
+        prop = ReactiveProperty(0)
+        target = self.listener()
+        prop.subscribe(target.on, weak=True)
+        prop.value = 1
+        del target
+        gc.collect()
+        prop.value = 2
+
+        self.assertEqual(len(prop.on_changed), 0)
+
+
+class dispatch_test(unittest.IsolatedAsyncioTestCase):
+
+    async def test_invoke_async(self):
+        received = []
+        on_value = action[int]()
+
+        async def slow(v):
+            await asyncio.sleep(0.05)
+            received.append(("slow", v))
+
+        async def hang(v):
+            await asyncio.sleep(10)
+
+        def fails(v):
+            raise ValueError(v)
+
+        on_value += slow
+        on_value += hang
+        on_value += fails
+        on_value += lambda v: received.append(("sync", v))
+
+        started = time.perf_counter()
+        errors = await on_value.invoke_async(1, timeout=0.2)
+
+        self.assertLess(time.perf_counter() - started, 1)
+        self.assertEqual(sorted(received), [("slow", 1), ("sync", 1)])
+        self.assertEqual([type(e) for e in errors], [TimeoutError, ValueError])
+
+    async def test_invoke_async_awaitables(self):
+        class later:
+            def __await__(self):
+                yield from asyncio.sleep(0).__await__()
+                raise KeyError("later")
+
+        on_value = action[int]()
+        on_value += lambda v: later()
+        on_value += lambda v: 1 / v
+
+        errors = await on_value.invoke_async(0)
+
+        self.assertEqual([type(e) for e in errors], [KeyError, ZeroDivisionError])
+
+    def test_invoke_parallel(self):
+        on_value = action[float]()
+        for _ in range(4):
+            on_value += time.sleep
+        on_value += lambda v: 1 / 0
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            started = time.perf_counter()
+            errors = on_value.invoke_parallel(executor, 0.1)
+            elapsed = time.perf_counter() - started
+
+        self.assertLess(elapsed, 0.35)
+        self.assertEqual([type(e) for e in errors], [ZeroDivisionError])
+
+    def test_invoke_parallel_timeout(self):
+        on_value = action[float](time.sleep)
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            errors = on_value.invoke_parallel(executor, 0.3, timeout=0.05)
+
+        self.assertEqual(len(errors), 1)
+        self.assertIsInstance(errors[0], TimeoutError)
+
+
+if __name__ == "__main__":
+    unittest.main()
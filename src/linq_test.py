@@ -1,5 +1,7 @@
+import importlib.util
+import itertools
 import unittest
-from omnim.linq import linq, range
+from omnim.linq import capability, last, linq, range, repeat
 
 
 class linq_test(unittest.TestCase):
@@ -41,6 +43,173 @@ class linq_test(unittest.TestCase):
         self.assertEqual(ordered, [9, 8, 5, 3, 1])
         print(f"[LINQ] order_by(desc): {ordered}")
 
+    def test_then_by(self):
+        data = [("b", 2), ("a", 2), ("c", 1), ("a", 1)]
+
+        ordered = (
+            linq(data)
+            .order_by(lambda x: x[1], descending=True)
+            .then_by(lambda x: x[0])
+            .as_list()
+        )
+
+        self.assertEqual(ordered, [("a", 2), ("b", 2), ("a", 1), ("c", 1)])
+        print(f"[LINQ] then_by: {ordered}")
+
+    def test_order_by_take(self):
+        data = [5, 1, 8, 3, 9, 1, 7]
+        calls = 0
+
+        def key(x):
+            nonlocal calls
+            calls += 1
+            return x
+
+        top = linq(data).order_by(key).take(3).as_list()
+
+        self.assertEqual(top, [1, 1, 3])
+        self.assertEqual(calls, len(data))
+        self.assertEqual(linq(data).order_by(key, descending=True).first(), 9)
+
+    def test_order_by_external(self):
+        data = [(i * 7919) % 1000 for i in list(range(0, 1000))]
+
+        ordered = linq(iter(data)).order_by(lambda x: x, run_size=64).as_list()
+
+        self.assertEqual(ordered, sorted(data))
+
+        unpicklable = linq([lambda: 1] * 6).order_by(lambda f: f(), run_size=2)
+        with self.assertRaises(TypeError):
+            unpicklable.as_list()
+
+    def test_lazy_short_circuit(self):
+        naturals = linq(itertools.count())
+
+        result = (
+            naturals.select(lambda x: x % 7)
+            .distinct()
+            .skip(2)
+            .take_while(lambda x: x < 6)
+            .as_list()
+        )
+
+        self.assertEqual(result, [2, 3, 4, 5])
+
+    def test_chunk_window(self):
+        data = [1, 2, 3, 4, 5]
+
+        self.assertEqual(linq(data).chunk(2).as_list(), [[1, 2], [3, 4], [5]])
+        self.assertEqual(linq(data).window(4).as_list(), [(1, 2, 3, 4), (2, 3, 4, 5)])
+
+    def test_aggregate(self):
+        words = ["linq", "omnim", "rx"]
+
+        self.assertEqual(linq(words).aggregate(lambda a, w: f"{a},{w}"), "linq,omnim,rx")
+        self.assertEqual(linq(words).sum(len), 11)
+        self.assertEqual(linq(words).max_by(len), "omnim")
+        self.assertEqual(linq(words).min_by(len), "rx")
+        with self.assertRaises(ValueError):
+            linq([]).aggregate(lambda a, b: a)
+
+    def test_distinct_bounded(self):
+        data = [i % 100 for i in list(range(0, 1000))]
+
+        result = linq(data).distinct(capacity=1000, error_rate=0.001).as_list()
+
+        self.assertLessEqual(len(result), 100)
+        self.assertGreater(len(result), 90)
+
+    def test_memoize(self):
+        calls = 0
+
+        def expensive(x):
+            nonlocal calls
+            calls += 1
+            return x * x
+
+        squares = linq(x for x in [1, 2, 3, 4]).select(expensive).memoize()
+        a, b = iter(squares), iter(squares)
+
+        self.assertEqual((next(a), next(a), next(b)), (1, 4, 1))
+        self.assertEqual(squares.count(), 4)
+        self.assertEqual(squares.as_list(), [1, 4, 9, 16])
+        self.assertEqual(calls, 4)
+
+    def test_materialize(self):
+        snapshot = linq(x for x in [3, 1, 2]).materialize("q")
+
+        self.assertEqual(snapshot.count(), 3)
+        self.assertEqual(snapshot.order_by(lambda x: x).as_list(), [1, 2, 3])
+
+    def test_sequence_fast_paths(self):
+        calls = 0
+
+        def double(x):
+            nonlocal calls
+            calls += 1
+            return x * 2
+
+        doubled = linq(list(range(0, 1000))).select(double)
+
+        self.assertTrue(doubled.capabilities & capability.indexable)
+        self.assertEqual(doubled.count(), 1000)
+        self.assertEqual(doubled.skip(10).take(3).as_list(), [20, 22, 24])
+        self.assertEqual(doubled.last(lambda x: x % 3 == 0), 1998)
+        self.assertEqual(calls, 4)
+
+    def test_last_plain_iterable(self):
+        self.assertEqual(last(x for x in [1, 2, 3]), 3)
+        self.assertEqual(last([1, 2, 3], lambda x: x < 3), 2)
+        with self.assertRaises(ValueError):
+            last([])
+
+    def test_sorted_capability(self):
+        data = [3, 1, 2, 3, 1]
+
+        ordered = linq(data).order_by().materialize()
+
+        self.assertTrue(ordered.capabilities & capability.sorted)
+        self.assertIn(2, ordered)
+        self.assertNotIn(4, ordered)
+        self.assertEqual(ordered.distinct().as_list(), [1, 2, 3])
+        self.assertFalse(ordered.select(lambda x: -x).capabilities & capability.sorted)
+
+        view = linq(data).order_by()
+        self.assertIn(3, view)
+        self.assertFalse(view.contains(4))
+        self.assertIn(1, view.where(lambda x: x < 3))
+
+    def test_range_repeat_sequences(self):
+        numbers = range(5, 1_000_000_000)
+        dashes = repeat("-", 1_000_000_000)
+
+        self.assertEqual(numbers.count(), 1_000_000_000)
+        self.assertEqual(numbers.skip(10).take(3).as_list(), [15, 16, 17])
+        self.assertEqual(numbers.last(), 1_000_000_004)
+        self.assertIn(123_456_789, numbers)
+        self.assertEqual(dashes.skip(999_999_998).count(), 2)
+        self.assertIn("-", dashes)
+        self.assertEqual(dashes.distinct().as_list(), ["-"])
+
+        self.assertEqual(len(numbers), 1_000_000_000)
+        self.assertEqual(numbers[3], 8)
+        self.assertEqual(numbers[-1], 1_000_000_004)
+        self.assertEqual(numbers[2:5].as_list(), [7, 8, 9])
+        self.assertTrue(numbers[2:5].capabilities & capability.sorted)
+        self.assertEqual(list(reversed(range(5, 3))), [7, 6, 5])
+        self.assertEqual(len(dashes[10:20]), 10)
+        self.assertEqual(dashes[123], "-")
+        self.assertEqual(list(reversed(repeat("x", 2))), ["x", "x"])
+        self.assertFalse(range(5, 0))
+        with self.assertRaises(IndexError):
+            repeat("x", 2)[2]
+
+    @unittest.skipUnless(importlib.util.find_spec("numpy"), "numpy is not installed")
+    def test_to_numpy(self):
+        self.assertEqual(range(2, 4).to_numpy().tolist(), [2, 3, 4, 5])
+        self.assertEqual(repeat(1.5, 3).to_numpy().tolist(), [1.5, 1.5, 1.5])
+        self.assertEqual(linq([1, 2, 3]).select(lambda x: x * 2).to_numpy(int).tolist(), [2, 4, 6])
+
     def test_complex_chain(self):
         result = (
             range(10, 10)
@@ -1,48 +1,47 @@
 from dataclasses import dataclass
 import random
-from time import perf_counter
 from omnim.rng import HAS_RUST as HAS_RUST_RNG, randints, randfloats, search
-from omnim.time import benchmark
+from omnim.time import benchmark, suite
 import omnim.mathr as mathr
 from omnim.step import frange
 import math
 
 
-def bench(m):
-    def wrapper(func):
-        def inner_wrapper(*args, **kwargs):
-            start = perf_counter()
-            for _ in range(m):
-                func(*args, **kwargs)
-            end = perf_counter()
-            elapsed = (end - start) * 1000
-            print(f"{func.__name__.ljust(len('omnim_xxx_')+15)}: {elapsed/m:.3f} ms")
-
-        return inner_wrapper
-
-    return wrapper
-
-
 M = 10
 N = 100_000_000
+RANDOM_N = 1_000_000
+
+rng_suite = suite(repeat=M, number=1, warmup=0)
+random_suite = suite(repeat=M, number=1, warmup=0)
+mathr_suite = suite(repeat=M, number=1, warmup=0)
 
 
-@bench(M)
+@rng_suite.add
 def omnim_rng_randints(N):
     _ = randints(N, 0, 10)
 
 
-@bench(M)
+@rng_suite.add
 def omnim_rng_randfloats(N):
     _ = randfloats(N, 0, 10)
 
 
-@bench(M)
+@random_suite.add
+def omnim_rng_randints_small(N):
+    _ = randints(N, 0, 10)
+
+
+@random_suite.add
 def random_randint(N):
     _ = [random.randint(0, 10) for _ in range(N)]
 
 
-@bench(M)
+@random_suite.add
+def omnim_rng_randfloats_small(N):
+    _ = randfloats(N, 0, 10)
+
+
+@random_suite.add
 def random_uniform(N):
     _ = [random.uniform(0, 10) for _ in range(N)]
 
@@ -57,19 +56,20 @@ class Item:
 def rng_test():
     print(f"{HAS_RUST_RNG=}")
 
-    omnim_rng_randints(N)
-    omnim_rng_randfloats(N)
-    # random_randint(N)
-    # random_uniform(N)
+    rng_suite.run(N)
+    print(rng_suite.table())
+
+    random_suite.run(RANDOM_N)
+    print(random_suite.table(baseline="random_randint"))
 
 
-@bench(M)
+@mathr_suite.add
 def omnim_mathr_sinx(N):
     for _ in range(N):
         _ = mathr.sin(0.1)
 
 
-@bench(M)
+@mathr_suite.add
 def math_sinx(N):
     for _ in range(N):
         _ = math.sin(0.1)
@@ -79,8 +79,8 @@ def math_sinx(N):
 def mathr_test():
     print(f"{mathr.HAS_RUST=}")
 
-    omnim_mathr_sinx(N)
-    math_sinx(N)
+    mathr_suite.run(N)
+    print(mathr_suite.table(baseline="math_sinx"))
 
 
 @benchmark
@@ -0,0 +1,62 @@
+import gc
+import tracemalloc
+from omnim.rx import ReactiveProperty
+from omnim.time import suite
+
+
+def memory(n):
+    def wrapper(func):
+        def inner_wrapper(*args, **kwargs):
+            gc.collect()
+            tracemalloc.start()
+            before = tracemalloc.get_traced_memory()[0]
+            cells = func(*args, **kwargs)
+            after = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            print(f"{func.__name__.ljust(24)}: {(after - before) / n:.1f} bytes/property")
+            del cells
+
+        return inner_wrapper
+
+    return wrapper
+
+
+M = 5
+N = 1_000_000
+
+set_suite = suite(repeat=M, number=1, warmup=0)
+
+
+@memory(N)
+def unsubscribed(n):
+    return [ReactiveProperty(0) for _ in range(n)]
+
+
+@memory(N)
+def subscribed(n):
+    cells = [ReactiveProperty(0) for _ in range(n)]
+    for cell in cells:
+        cell.subscribe(print)
+    return cells
+
+
+@set_suite.add
+def set_unsubscribed(n):
+    cell = ReactiveProperty(0)
+    for i in range(n):
+        cell.value = i
+
+
+@set_suite.add
+def set_subscribed(n):
+    cell = ReactiveProperty(0)
+    cell.subscribe(lambda e: None)
+    for i in range(n):
+        cell.value = i
+
+
+if __name__ == "__main__":
+    unsubscribed(N)
+    subscribed(N)
+    set_suite.run(N)
+    print(set_suite.table())
@@ -0,0 +1,306 @@
+import asyncio
+import gc
+import threading
+import weakref
+import unittest
+from omnim.rx import ReactiveProperty, RxEvent, computed
+
+
+class property_test(unittest.TestCase):
+
+    def test_compact(self):
+        cell = ReactiveProperty(0)
+        self.assertFalse(hasattr(cell, "__dict__"))
+        self.assertFalse(hasattr(RxEvent(0, 1), "__dict__"))
+
+    def test_lazy_subscribers(self):
+        cell = ReactiveProperty(0)
+        cell.value = 1
+        cell.notify()
+        cell.dispose()
+        self.assertIsNone(cell._ReactiveProperty__on_changed)
+
+        events = []
+        cell.on_changed += events.append
+        cell.value = 2
+        self.assertEqual([(e.pre, e.new) for e in events], [(1, 2)])
+
+
+class batch_test(unittest.TestCase):
+
+    def test_batch_coalesces(self):
+        events = []
+        counter = ReactiveProperty(0)
+        counter.subscribe(lambda e: events.append((e.pre, e.new)))
+
+        with counter.batch():
+            for i in range(1, 1000 + 1):
+                counter.value = i
+            with counter.batch():
+                counter.value = 2000
+            self.assertEqual(events, [])
+
+        self.assertEqual(events, [(0, 2000)])
+        self.assertEqual(counter.value, 2000)
+
+    def test_batch_releases_old_value(self):
+        class box:
+            pass
+
+        first = box()
+        ref = weakref.ref(first)
+        cell = ReactiveProperty(first)
+        with cell.batch():
+            cell.value = box()
+        del first
+        cell.value = 3
+        gc.collect()
+
+        self.assertIsNone(ref())
+
+    def test_batch_unchanged(self):
+        events = []
+        counter = ReactiveProperty(0)
+        counter.subscribe(events.append)
+
+        with counter.batch():
+            counter.value = 1
+            counter.value = 0
+
+        self.assertEqual(events, [])
+
+
+class timing_test(unittest.IsolatedAsyncioTestCase):
+
+    async def test_throttle(self):
+        source = ReactiveProperty(0)
+        throttled = source.throttle(0.05)
+        seen = []
+        throttled.subscribe(lambda e: seen.append(e.new))
+
+        for i in range(1, 5 + 1):
+            source.value = i
+        await asyncio.sleep(0.1)
+
+        self.assertEqual(seen, [1, 5])
+        throttled.dispose()
+
+    async def test_debounce(self):
+        source = ReactiveProperty(0)
+        debounced = source.debounce(0.05)
+        seen = []
+        debounced.subscribe(lambda e: seen.append(e.new))
+
+        for i in range(1, 5 + 1):
+            source.value = i
+            await asyncio.sleep(0.01)
+        self.assertEqual(seen, [])
+        await asyncio.sleep(0.1)
+
+        self.assertEqual(seen, [5])
+        debounced.dispose()
+        self.assertEqual(len(source.on_changed), 0)
+
+    async def test_sample(self):
+        source = ReactiveProperty(0)
+        sampled = source.sample(0.03)
+        source.value = 1
+        source.value = 2
+        self.assertEqual(sampled.value, 0)
+
+        await asyncio.sleep(0.05)
+        self.assertEqual(sampled.value, 2)
+        sampled.dispose()
+
+
+class observable_test(unittest.TestCase):
+
+    def test_pipeline_is_shared(self):
+        source = ReactiveProperty(0)
+        calls = []
+
+        def square(v):
+            calls.append(v)
+            return v * v
+
+        squares = source.as_observable().map(square).where(lambda v: v % 2 == 0)
+        self.assertFalse(squares.connected)
+
+        a, b = [], []
+        sub_a = squares.subscribe(a.append)
+        sub_b = squares.subscribe(b.append)
+        for i in range(1, 4 + 1):
+            source.value = i
+
+        self.assertEqual(a, [4, 16])
+        self.assertEqual(b, [4, 16])
+        self.assertEqual(calls, [1, 2, 3, 4])
+
+        sub_a.dispose()
+        self.assertTrue(squares.connected)
+        sub_b.dispose()
+        self.assertFalse(squares.connected)
+        self.assertEqual(len(source.on_changed), 0)
+
+    def test_distinct_scan_buffer(self):
+        source = ReactiveProperty(0)
+        values = source.as_observable()
+        out = []
+        values.map(lambda v: v // 2).distinct_until_changed().subscribe(out.append)
+        totals = []
+        values.scan(lambda acc, v: acc + v, 0).subscribe(totals.append)
+        chunks = []
+        values.buffer(count=2).subscribe(chunks.append)
+
+        for i in range(1, 5 + 1):
+            source.value = i
+
+        self.assertEqual(out, [0, 1, 2])
+        self.assertEqual(totals, [1, 3, 6, 10, 15])
+        self.assertEqual(chunks, [[1, 2], [3, 4]])
+
+    def test_merge_combine_latest(self):
+        x, y = ReactiveProperty(0), ReactiveProperty("")
+        merged, combined = [], []
+        x.as_observable().merge(y.as_observable()).subscribe(merged.append)
+        x.as_observable().combine_latest(y.as_observable()).subscribe(combined.append)
+
+        x.value = 1
+        y.value = "a"
+        x.value = 2
+
+        self.assertEqual(merged, [1, "a", 2])
+        self.assertEqual(combined, [(1, "a"), (2, "a")])
+
+
+class observable_timing_test(unittest.IsolatedAsyncioTestCase):
+
+    async def test_buffer_seconds(self):
+        source = ReactiveProperty(0)
+        chunks = []
+        sub = source.as_observable().buffer(seconds=0.03).subscribe(chunks.append)
+        source.value = 1
+        source.value = 2
+        await asyncio.sleep(0.05)
+        sub.dispose()
+
+        self.assertEqual(chunks, [[1, 2]])
+
+
+class computed_test(unittest.TestCase):
+
+    def test_lazy(self):
+        width, height = ReactiveProperty(2), ReactiveProperty(3)
+        area = computed(lambda: width.value * height.value)
+        self.assertEqual(area.recomputes, 0)
+
+        self.assertEqual(area.value, 6)
+        width.value = 4
+        height.value = 5
+        self.assertTrue(area.dirty)
+        self.assertEqual(area.recomputes, 1)
+
+        self.assertEqual(area.value, 20)
+        self.assertEqual(area.value, 20)
+        self.assertEqual(area.recomputes, 2)
+
+    def test_dynamic_dependencies(self):
+        flag, a, b = ReactiveProperty(True), ReactiveProperty(1), ReactiveProperty(2)
+        pick = computed(lambda: a.value if flag.value else b.value)
+        self.assertEqual(pick.value, 1)
+
+        b.value = 3
+        self.assertFalse(pick.dirty)
+        flag.value = False
+        self.assertEqual(pick.value, 3)
+        a.value = 10
+        self.assertFalse(pick.dirty)
+
+    def test_diamond_glitch_free(self):
+        a = ReactiveProperty(1)
+        b = computed(lambda: a.value + 1)
+        c = computed(lambda: a.value * 2)
+        seen = []
+        d = computed(lambda: (b.value, c.value))
+        d.subscribe(lambda e: seen.append(e.new))
+
+        a.value = 2
+        a.value = 3
+
+        self.assertEqual(seen, [(3, 4), (4, 6)])
+        self.assertEqual(d.recomputes, 3)
+        self.assertEqual(b.recomputes, 3)
+
+    def test_once_per_batch(self):
+        a = ReactiveProperty(0)
+        total = computed(lambda: a.value * 10)
+        seen = []
+        total.subscribe(lambda e: seen.append((e.pre, e.new)))
+
+        with a.batch():
+            for i in range(1, 100 + 1):
+                a.value = i
+
+        self.assertEqual(seen, [(0, 1000)])
+        self.assertEqual(total.recomputes, 2)
+
+    def test_read_inside_batch(self):
+        a = ReactiveProperty(1)
+        c = computed(lambda: a.value * 10)
+        seen = []
+        c.subscribe(lambda e: seen.append((e.pre, e.new)))
+
+        with a.batch():
+            a.value = 2
+            self.assertEqual(c.value, 20)
+            a.value = 3
+            self.assertEqual(seen, [])
+
+        self.assertEqual(c.value, 30)
+        self.assertEqual(seen, [(10, 30)])
+
+    def test_tracking_is_per_thread(self):
+        a, b = ReactiveProperty(1), ReactiveProperty(2)
+        inside = threading.Event()
+        release = threading.Event()
+
+        def slow():
+            inside.set()
+            release.wait(1)
+            return a.value
+
+        slow_c = computed(slow)
+        worker = threading.Thread(target=lambda: slow_c.value)
+        worker.start()
+        inside.wait(1)
+        other = computed(lambda: b.value)
+        self.assertEqual(other.value, 2)
+        release.set()
+        worker.join()
+
+        self.assertEqual(set(a._dependents), {slow_c})
+        self.assertEqual(set(b._dependents), {other})
+
+    def test_dispose(self):
+        a = ReactiveProperty(1)
+        double = computed(lambda: a.value * 2)
+        self.assertEqual(double.value, 2)
+        double.dispose()
+        self.assertFalse(a._dependents)
+
+    def test_unreferenced_computed_is_collected(self):
+        a = ReactiveProperty(1)
+        double = computed(lambda: a.value * 2)
+        self.assertEqual(double.value, 2)
+        ref = weakref.ref(double)
+
+        del double
+        gc.collect()
+
+        self.assertIsNone(ref())
+        self.assertFalse(a._dependents)
+        a.value = 2
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+import io
+from omnim.sb import stringbuilder
+from omnim.time import suite
+
+
+M = 5
+N = 1_000_000
+LINE = "2024-01-01T00:00:00 INFO request handled id="
+
+append_suite = suite(repeat=M, number=1, warmup=0)
+large_suite = suite(repeat=M, number=1, warmup=0)
+edit_suite = suite(repeat=M, number=1, warmup=0)
+format_suite = suite(repeat=M, number=1, warmup=0)
+
+
+@append_suite.add
+def omnim_stringbuilder(n):
+    sb = stringbuilder()
+    for i in range(n):
+        sb.append(LINE)
+        sb.append(i)
+        sb.append("\n")
+    _ = str(sb)
+
+
+@append_suite.add
+def io_stringio(n):
+    buf = io.StringIO()
+    for i in range(n):
+        buf.write(LINE)
+        buf.write(str(i))
+        buf.write("\n")
+    _ = buf.getvalue()
+
+
+@append_suite.add
+def str_join(n):
+    parts = []
+    for i in range(n):
+        parts.append(LINE)
+        parts.append(str(i))
+        parts.append("\n")
+    _ = "".join(parts)
+
+
+@large_suite.add
+def omnim_stringbuilder_1mb(n):
+    sb = stringbuilder()
+    sb.append("x" * n)
+    _ = str(sb)
+
+
+@edit_suite.add
+def omnim_stringbuilder_edit(n):
+    sb = stringbuilder()
+    sb.append("x" * n)
+    for i in range(1_000):
+        sb.insert((i * 7919) % n, "edit")
+        sb.remove((i * 104729) % n, 4)
+        _ = sb[(i * 31) % n]
+
+
+@edit_suite.add
+def str_edit(n):
+    text = "x" * n
+    for i in range(1_000):
+        idx = (i * 7919) % n
+        text = text[:idx] + "edit" + text[idx:]
+        idx = (i * 104729) % n
+        text = text[:idx] + text[idx + 4 :]
+        _ = text[(i * 31) % n]
+
+
+ROW = "<tr><td>{}</td><td>{:>8}</td><td>{:.2f}</td><td>{!r}</td></tr>\n"
+
+
+@format_suite.add
+def omnim_append_format_compiled(n):
+    sb = stringbuilder()
+    row = stringbuilder.compile_format(ROW)
+    for i in range(n // 10):
+        sb.append_format(row, "item", i, i / 7, "ok")
+    _ = str(sb)
+
+
+@format_suite.add
+def omnim_appender(n):
+    sb = stringbuilder()
+    row = sb.appender(ROW)
+    for i in range(n // 10):
+        row("item", i, i / 7, "ok")
+    _ = str(sb)
+
+
+@format_suite.add
+def omnim_append_format(n):
+    sb = stringbuilder()
+    for i in range(n // 10):
+        sb.append_format(ROW, "item", i, i / 7, "ok")
+    _ = str(sb)
+
+
+@format_suite.add
+def str_format(n):
+    parts = []
+    for i in range(n // 10):
+        parts.append(ROW.format("item", i, i / 7, "ok"))
+    _ = "".join(parts)
+
+
+@format_suite.add
+def f_string(n):
+    parts = []
+    for i in range(n // 10):
+        parts.append(f"<tr><td>{'item'}</td><td>{i:>8}</td><td>{i / 7:.2f}</td><td>{'ok'!r}</td></tr>\n")
+    _ = "".join(parts)
+
+
+if __name__ == "__main__":
+    print(f"{N=:#,}")
+    print(f"{M=}")
+
+    for bench in (append_suite, large_suite, edit_suite, format_suite):
+        bench.run(N)
+        print(bench.table())
+        print()
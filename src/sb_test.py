@@ -0,0 +1,191 @@
+import io
+from array import array
+import unittest
+from omnim.sb import bytesbuilder, format_template, stringbuilder
+
+
+class stringbuilder_test(unittest.TestCase):
+
+    def test_chunk_cap_compat(self):
+        with self.assertWarns(DeprecationWarning):
+            sb = stringbuilder(chunk_cap=32)
+        sb.append("ok")
+        self.assertEqual(str(sb), "ok")
+
+    def test_append(self):
+        sb = stringbuilder()
+        sb.append("Hello")
+        sb.append(", ")
+        sb.append(42)
+        sb.append_format("{}!", "omnim")
+
+        self.assertEqual(str(sb), "Hello, 42omnim!")
+
+    def test_append_line(self):
+        sb = stringbuilder()
+        sb.append_line("a")
+        sb.append_line("b")
+        sb.append("c\n")
+        sb.append_line("d")
+
+        self.assertEqual(str(sb), "a\nbc\nd")
+
+    def test_insert_remove(self):
+        sb = stringbuilder()
+        for word in ["alpha", "beta", "gamma"]:
+            sb.append(word)
+
+        sb.insert(7, "--")
+        sb.insert(0, ">")
+        sb.insert(100, "<")
+        self.assertEqual(str(sb), ">alphabe--tagamma<")
+
+        sb.remove(3, 8)
+        self.assertEqual(str(sb), ">alagamma<")
+
+        sb.remove(8, 100)
+        self.assertEqual(str(sb), ">alagamm")
+
+    def test_large_append(self):
+        sb = stringbuilder()
+        sb.append("x" * 1_000_000)
+        sb.insert(500_000, "y")
+
+        text = str(sb)
+        self.assertEqual(len(text), 1_000_001)
+        self.assertEqual(text[500_000], "y")
+
+    def test_indexing(self):
+        sb = stringbuilder()
+        sb.append("0123456789")
+        sb.insert(5, "abc")
+
+        self.assertEqual(sb[0], "0")
+        self.assertEqual(sb[5], "a")
+        self.assertEqual(sb[-1], "9")
+        self.assertEqual(sb[3:9], "34abc5")
+        self.assertEqual(sb[::4], "0459")
+        self.assertEqual(sb.substring(4, 5), "4abc5")
+        with self.assertRaises(IndexError):
+            sb[13]
+
+    def test_large_document_edits(self):
+        sb = stringbuilder()
+        text = "".join(f"line {i}\n" for i in range(200_000))
+        sb.append(text)
+
+        for i in range(1000):
+            sb.insert(i * 1000, "#")
+            text = text[: i * 1000] + "#" + text[i * 1000 :]
+        sb.remove(10, 500_000)
+        text = text[:10] + text[500_010:]
+
+        self.assertEqual(str(sb), text)
+        self.assertEqual(sb[123_456], text[123_456])
+
+    def test_len_and_cached_str(self):
+        sb = stringbuilder()
+        for i in range(100):
+            sb.append(i)
+
+        text = str(sb)
+        self.assertIs(str(sb), text)
+        self.assertEqual(len(sb), len(text))
+
+        sb.insert(0, "[")
+        sb.append("]")
+        self.assertEqual(str(sb), f"[{text}]")
+        self.assertEqual(len(sb), len(text) + 2)
+
+        sb.remove(0, 1)
+        self.assertEqual(str(sb), f"{text}]")
+        sb.clear()
+        self.assertEqual((len(sb), str(sb)), (0, ""))
+
+    def test_compile_format(self):
+        row = stringbuilder.compile_format("{name!r:<8}|{0:>6.2f}|{0}|{{x}}\n")
+        sb = stringbuilder()
+        for value in [1.5, 22.125]:
+            sb.append_format(row, value, name="pi")
+
+        expected = "".join(
+            "{name!r:<8}|{0:>6.2f}|{0}|{{x}}\n".format(v, name="pi") for v in [1.5, 22.125]
+        )
+        self.assertEqual(str(sb), expected)
+        self.assertEqual(len(sb), len(expected))
+
+    def test_appender(self):
+        sb = stringbuilder()
+        sb.append("> ")
+        row = sb.appender("{}={:.1f};")
+        for i in range(3):
+            row(i, i / 2)
+
+        self.assertEqual(str(sb), "> 0=0.0;1=0.5;2=1.0;")
+        self.assertEqual(len(sb), 20)
+        sb.insert(0, "#")
+        row(3, 1.5)
+        self.assertEqual(str(sb), "#> 0=0.0;1=0.5;2=1.0;3=1.5;")
+
+    def test_compile_format_fields(self):
+        self.assertEqual(format_template("{0[1]}-{0[0]}")(["a", "b"]), "b-a")
+        self.assertEqual(format_template("{:{w}}|")("a", w=3), "a  |")
+        self.assertEqual(format_template("{0.real:+}")(2), "+2")
+        with self.assertRaises(ValueError):
+            format_template("{}{0}")
+        with self.assertRaises(IndexError):
+            format_template("{} {}")(1)
+
+    def test_write_to(self):
+        sb = stringbuilder()
+        sb.append("héllo, ")
+        sb.append("x" * 100_000)
+        sb.insert(5, "!")
+        text = str(sb)
+
+        out = io.StringIO()
+        self.assertEqual(sb.write_to(out), len(text))
+        self.assertEqual(out.getvalue(), text)
+
+        raw = io.BytesIO()
+        self.assertEqual(sb.write_to(raw, "utf-8"), len(text.encode()))
+        self.assertEqual(raw.getvalue(), text.encode())
+        self.assertEqual(sb.getbuffer().tobytes(), text.encode())
+
+
+class bytesbuilder_test(unittest.TestCase):
+
+    def test_append_typed_memoryview(self):
+        ints = array("i", [1, 2])
+        bb = bytesbuilder()
+        bb.append(memoryview(ints))
+        bb.append(memoryview(ints)[::-1])
+
+        self.assertEqual(bytes(bb), ints.tobytes() + array("i", [2, 1]).tobytes())
+
+    def test_append(self):
+        bb = bytesbuilder(capacity=4)
+        bb.append("héllo")
+        bb.append(b",")
+        bb.append(42)
+        bb.append_line("csv")
+
+        self.assertEqual(bytes(bb), "héllo,42\ncsv".encode())
+        self.assertEqual(len(bb), 13)
+        self.assertEqual(bb.capacity, 16)
+
+    def test_getbuffer_write_to(self):
+        bb = bytesbuilder()
+        for i in range(1000):
+            bb.append_join(",", i, i * 2)
+            bb.append(b"\n")
+
+        with bb.getbuffer() as view:
+            self.assertEqual(view[:6].tobytes(), b"0,0\n1,")
+        out = io.BytesIO()
+        self.assertEqual(bb.write_to(out), len(bb))
+        self.assertEqual(out.getvalue(), bytes(bb))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,33 @@
 import asyncio
+import gc
+import math
+import threading
+import time
 import unittest
+import weakref
+from contextlib import aclosing
 from datetime import datetime
-from omnim.task import wait_until, wait_any, with_timeout, interval
+from omnim.delegate import action
+from omnim.rx import ReactiveProperty
+from omnim.task import (
+    as_completed,
+    delay,
+    frame_loop,
+    map_concurrent,
+    run_batched,
+    run_in_process,
+    run_in_thread,
+    scope,
+    shutdown,
+    interval,
+    timer_wheel,
+    wait_any,
+    wait_until,
+    wait_while,
+    wheel,
+    with_timeout,
+    workers,
+)
 
 
 class TestOmnimAsync(unittest.IsolatedAsyncioTestCase):
@@ -67,6 +93,315 @@ class TestOmnimAsync(unittest.IsolatedAsyncioTestCase):
         print(f"[Async] interval(10ms) での5回チェック時間: {end - start:.4f}秒")
         self.assertLess(end - start, 0.1)
 
+    async def test_wait_until_on_property(self):
+        level = ReactiveProperty(0)
+        checks = 0
+
+        def full():
+            nonlocal checks
+            checks += 1
+            return level.value >= 3
+
+        async def fill():
+            for i in range(1, 3 + 1):
+                await asyncio.sleep(0.02)
+                level.value = i
+
+        asyncio.create_task(fill())
+        start = asyncio.get_running_loop().time()
+        await wait_until(full, timeout=1.0, on=level)
+        end = asyncio.get_running_loop().time()
+
+        self.assertLess(end - start, 0.1)
+        self.assertEqual(checks, 2 + 3)
+        self.assertEqual(len(level.on_changed), 0)
+
+    async def test_wait_while_on_action(self):
+        busy = True
+        on_done = action[()]()
+
+        def finish():
+            nonlocal busy
+            busy = False
+            on_done()
+
+        asyncio.get_running_loop().call_later(0.02, finish)
+        await wait_while(lambda: busy, timeout=1.0, on=[on_done])
+        self.assertFalse(busy)
+
+    async def test_wait_until_on_timeout(self):
+        level = ReactiveProperty(0)
+        with self.assertRaises(TimeoutError):
+            await wait_until(lambda: level.value > 0, timeout=0.05, on=level)
+
+    async def test_wait_until_backoff(self):
+        interval(1.0)
+        counter = 0
+
+        def check():
+            nonlocal counter
+            counter += 1
+            return counter >= 5
+
+        try:
+            start = asyncio.get_running_loop().time()
+            await wait_until(check, backoff=True)
+            end = asyncio.get_running_loop().time()
+        finally:
+            interval(0.1)
+
+        self.assertLess(end - start, 0.1)
+
+    async def test_per_call_interval(self):
+        counter = 0
+
+        def check():
+            nonlocal counter
+            counter += 1
+            return counter >= 5
+
+        start = asyncio.get_running_loop().time()
+        await wait_until(check, interval_s=10)
+        end = asyncio.get_running_loop().time()
+
+        self.assertLess(end - start, 0.1)
+
+    async def test_timer_wheel(self):
+        loop = asyncio.get_running_loop()
+        timer = timer_wheel(loop)
+        fired = []
+
+        async def sleeper(seconds):
+            start = loop.time()
+            await timer.sleep(seconds)
+            fired.append((seconds, loop.time() - start))
+
+        await asyncio.gather(*(sleeper(s) for s in (0.3, 0.0, 0.02, 0.1, 0.02)))
+
+        self.assertEqual([s for s, _ in fired], [0.0, 0.02, 0.02, 0.1, 0.3])
+        for seconds, elapsed in fired:
+            self.assertGreaterEqual(elapsed, seconds)
+            self.assertLess(elapsed, seconds + 0.05)
+        self.assertEqual(len(timer), 0)
+
+    async def test_shared_wheel_batches_waiters(self):
+        ready = False
+
+        def set_ready():
+            nonlocal ready
+            ready = True
+
+        asyncio.get_running_loop().call_later(0.1, set_ready)
+        before = wheel().callbacks
+        await asyncio.gather(
+            *(wait_until(lambda: ready, interval_s=0.01) for _ in range(1_000))
+        )
+        await delay(0.01)
+
+        self.assertLess(wheel().callbacks - before, 100)
+
+    async def test_wait_any_cancel_rest(self):
+        async def slow_task():
+            await asyncio.sleep(10)
+
+        done, pending = await wait_any(asyncio.sleep(0.01), slow_task(), cancel_rest=True)
+
+        self.assertEqual(len(done), 1)
+        self.assertTrue(all(t.cancelled() for t in pending))
+
+    async def test_as_completed(self):
+        async def after(seconds):
+            await asyncio.sleep(seconds)
+            return seconds
+
+        results = [r async for r in as_completed(after(0.03), after(0.01), after(0.02))]
+        self.assertEqual(results, [0.01, 0.02, 0.03])
+
+        slow = asyncio.ensure_future(after(10))
+        async with aclosing(as_completed(after(0.01), slow)) as results:
+            async for r in results:
+                break
+        self.assertTrue(slow.cancelled())
+
+    async def test_map_concurrent(self):
+        running = peak = 0
+
+        async def square(x):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.001 * (x % 3))
+            running -= 1
+            return x * x
+
+        results = await map_concurrent(square, range(50), limit=4)
+
+        self.assertEqual(results, [x * x for x in range(50)])
+        self.assertEqual(peak, 4)
+
+    async def test_map_concurrent_failure(self):
+        started = []
+
+        async def check(x):
+            started.append(x)
+            await asyncio.sleep(0.01)
+            if x == 2:
+                raise ValueError(x)
+
+        with self.assertRaises(ValueError):
+            await map_concurrent(check, range(100), limit=4)
+        self.assertLess(len(started), 100)
+
+    async def test_scope_cancels_siblings(self):
+        sibling = None
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("boom")
+
+        with self.assertRaises(ExceptionGroup):
+            async with scope() as s:
+                sibling = s.spawn(asyncio.sleep(10))
+                s.spawn(fail())
+
+        self.assertTrue(sibling.cancelled())
+
+    async def test_scope_limit_failure_closes_queued(self):
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("boom")
+
+        queued = [asyncio.sleep(10) for _ in range(3)]
+        with self.assertRaises(ExceptionGroup):
+            async with scope(limit=1) as s:
+                s.spawn(fail())
+                for coro in queued:
+                    s.spawn(coro)
+
+        self.assertTrue(all(c.cr_frame is None for c in queued))
+
+    async def test_scope_limit(self):
+        running = peak = 0
+
+        async def job():
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.005)
+            running -= 1
+
+        async with scope(limit=3) as s:
+            for _ in range(10):
+                s.spawn(job())
+
+        self.assertEqual(peak, 3)
+
+    async def test_run_in_thread(self):
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.005)
+
+        def blocking(seconds):
+            time.sleep(seconds)
+            return threading.current_thread().name
+
+        t = asyncio.create_task(ticker())
+        name = await run_in_thread(blocking, 0.1)
+        t.cancel()
+
+        self.assertTrue(name.startswith("omnim"))
+        self.assertGreater(ticks, 5)
+
+    async def test_run_in_process(self):
+        workers(processes=2)
+        try:
+            self.assertEqual(await run_in_process(math.factorial, 20), math.factorial(20))
+            results = await run_batched(math.isqrt, range(1000), batch_size=100)
+            self.assertEqual(results, [math.isqrt(i) for i in range(1000)])
+        finally:
+            shutdown()
+
+    async def test_frame_loop(self):
+        loop = frame_loop(100)
+        steps, renders = [], []
+        loop.on_update += steps.append
+        loop.on_render += renders.append
+
+        start = asyncio.get_running_loop().time()
+        stats = await loop.run(frames=20)
+        end = asyncio.get_running_loop().time()
+
+        self.assertEqual(stats.frames, 20)
+        self.assertEqual(len(renders), 20)
+        self.assertAlmostEqual(end - start, 0.2, delta=0.08)
+        self.assertGreaterEqual(len(steps), 15)
+        self.assertTrue(all(dt == loop.period_s for dt in steps))
+        self.assertAlmostEqual(stats.p50, 0.01, delta=0.005)
+
+    async def test_frame_loop_callback_error(self):
+        loop = frame_loop(100)
+
+        def explode(dt):
+            raise RuntimeError("update failed")
+
+        loop.on_update += explode
+
+        with self.assertRaises(RuntimeError):
+            await loop.run(frames=10)
+        self.assertFalse(loop.is_running)
+
+    async def test_frame_loop_catch_up_cap(self):
+        loop = frame_loop(200, max_steps=2)
+        loop.on_update += lambda dt: time.sleep(0.01)
+
+        stats = await loop.run(frames=10)
+
+        self.assertGreater(stats.overruns, 0)
+        self.assertGreater(stats.dropped_steps, 0)
+        self.assertGreaterEqual(stats.p99, stats.p50)
+
+    async def test_frame_loop_runs_twice(self):
+        loop = frame_loop(100)
+        updates = []
+        loop.on_update += updates.append
+
+        first = await loop.run(frames=10)
+        count = len(updates)
+        second = await loop.run(frames=10)
+
+        self.assertIsNot(first, second)
+        self.assertEqual((first.frames, second.frames), (10, 10))
+        self.assertGreater(len(updates), count)
+        self.assertGreater(min(first.percentile(0), second.percentile(0)), 0.005)
+
+    async def test_delay_zero_yields(self):
+        start = asyncio.get_running_loop().time()
+        for _ in range(100):
+            await delay(0)
+        end = asyncio.get_running_loop().time()
+
+        self.assertLess(end - start, 0.05)
+
+
+class timer_wheel_gc_test(unittest.TestCase):
+
+    def test_closed_loops_released(self):
+        loops = []
+
+        async def main():
+            loops.append(weakref.ref(asyncio.get_running_loop()))
+            await delay(0.002)
+
+        for _ in range(3):
+            asyncio.run(main())
+        gc.collect()
+
+        self.assertEqual([r() for r in loops], [None, None, None])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,178 @@
+import asyncio
+import io
+import json
+import threading
+import time
+import unittest
+import omnim.time
+from datetime import timedelta
+from omnim.time import (
+    bench_result,
+    disable_spans,
+    enable_spans,
+    measure,
+    reset_spans,
+    span,
+    spans,
+    stopwatch,
+    suite,
+    table,
+)
+
+
+class stopwatch_test(unittest.TestCase):
+
+    def test_lap(self):
+        laps = []
+        watch = stopwatch(auto_start=True, on_lap=laps.append)
+        time.sleep(0.01)
+        watch.lap()
+        watch.stop()
+
+        self.assertEqual(len(laps), 1)
+        self.assertGreaterEqual(laps[0], timedelta(seconds=0.01))
+        self.assertLess(laps[0], timedelta(seconds=1))
+        self.assertEqual(list(watch.laps), laps)
+        self.assertGreaterEqual(watch.elapsed, laps[0])
+
+
+class benchmark_test(unittest.TestCase):
+
+    def test_measure_calibrates(self):
+        calls = 0
+
+        def work():
+            nonlocal calls
+            calls += 1
+            sum(range(100))
+
+        result = measure(work, repeat=3, warmup=1, target_s=0.005)
+
+        self.assertEqual(result.name, "work")
+        self.assertEqual(len(result.samples), 3)
+        self.assertGreater(result.number, 1)
+        self.assertGreaterEqual(calls, 4 * result.number)
+        self.assertGreater(result.median, 0)
+
+    def test_statistics(self):
+        result = bench_result("r", 1, [float(i) for i in range(1, 100 + 1)])
+
+        self.assertEqual(result.mean, 50.5)
+        self.assertEqual(result.median, 50.5)
+        self.assertEqual(result.min, 1.0)
+        self.assertEqual(result.p99, 99.0)
+        self.assertAlmostEqual(result.stddev, 29.011, places=3)
+
+    def test_suite_table_json(self):
+        bench = suite(repeat=3, number=10)
+        bench.add(lambda n: sum(range(n)), name="sum")
+        bench.add(lambda n: list(range(n)), name="list")
+        results = bench.run(1000)
+
+        self.assertEqual([r.name for r in results], ["sum", "list"])
+        lines = bench.table(baseline="sum").splitlines()
+        self.assertEqual(
+            lines[0].split(), ["name", "median", "mean", "stddev", "p99", "relative"]
+        )
+        self.assertTrue(lines[2].endswith("1.00x"))
+        self.assertEqual(table([]), "")
+        with self.assertRaises(ValueError):
+            bench.table(baseline="missing")
+
+        out = io.StringIO()
+        bench.to_json(out)
+        data = json.loads(out.getvalue())
+        self.assertEqual([r["name"] for r in data["results"]], ["sum", "list"])
+        self.assertEqual(len(data["results"][0]["samples"]), 3)
+
+
+class span_test(unittest.TestCase):
+
+    def tearDown(self):
+        disable_spans()
+        reset_spans()
+
+    def test_disabled_is_noop(self):
+        disable_spans()
+        reset_spans()
+        with span("off"):
+            pass
+        self.assertIs(span("a"), span("b"))
+        self.assertNotIn("off", spans())
+
+    def test_nested_paths(self):
+        enable_spans()
+        reset_spans()
+        for _ in range(3):
+            with span("outer"):
+                with span("inner"):
+                    time.sleep(0.001)
+
+        stats = spans()
+        self.assertEqual(stats["outer"].count, 3)
+        self.assertEqual(stats["outer/inner"].count, 3)
+        self.assertGreaterEqual(stats["outer/inner"].p50_ns, 1_000_000)
+        self.assertGreaterEqual(stats["outer"].max_ns, stats["outer/inner"].p50_ns)
+        self.assertEqual(sum(stats["outer"].buckets), 3)
+
+    def test_threads_and_ring(self):
+        enable_spans(capacity=16)
+        reset_spans()
+        done = threading.Barrier(5)
+
+        def work():
+            for _ in range(100):
+                with span("thread.work"):
+                    pass
+            done.wait()
+            done.wait()
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for t in threads:
+            t.start()
+        done.wait()
+        self.assertEqual(spans()["thread.work"].count, 4 * 16)
+        done.wait()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(spans()["thread.work"].count, 16)
+
+    def test_ended_threads_release_rings(self):
+        enable_spans(capacity=16)
+        reset_spans()
+        with span("main"):
+            pass
+        rings = len(omnim.time._span_rings)
+
+        def work():
+            with span("short"):
+                pass
+
+        for _ in range(20):
+            t = threading.Thread(target=work)
+            t.start()
+            t.join()
+
+        self.assertEqual(len(omnim.time._span_rings), rings)
+        self.assertEqual(spans()["short"].count, 16)
+
+    def test_concurrent_tasks(self):
+        enable_spans()
+        reset_spans()
+
+        async def worker(name):
+            with span(name):
+                await asyncio.sleep(0.001)
+                with span("leaf"):
+                    await asyncio.sleep(0.001)
+
+        async def main():
+            await asyncio.gather(worker("a"), worker("b"))
+
+        asyncio.run(main())
+        self.assertEqual(sorted(spans()), ["a", "a/leaf", "b", "b/leaf"])
+
+
+if __name__ == "__main__":
+    unittest.main()